@@ -8,7 +8,96 @@ Supports multiple methods of providing credentials.
 import os
 import json
 import base64
+import hashlib
+import logging
+import types
 from pathlib import Path
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# Where inline credentials are materialized for the GCP client
+TEMP_CREDS_PATH = "/tmp/gcp-credentials.json"
+
+# Records which payload was last written to TEMP_CREDS_PATH
+CREDS_SENTINEL_PATH = "/tmp/.gcp-creds-setup"
+
+REQUIRED_VARS = ("TELEGRAM_BOT_TOKEN", "GOOGLE_GEMINI_API_KEY", "GOOGLE_CLOUD_PROJECT")
+
+# (env values, result) of the last validate_environment() call
+_ENV_CACHE: Optional[tuple] = None
+
+# Variables the application reads at startup
+ENV_VARS = (
+    "TELEGRAM_BOT_TOKEN",
+    "GOOGLE_GEMINI_API_KEY",
+    "GOOGLE_CLOUD_PROJECT",
+    "GOOGLE_APPLICATION_CREDENTIALS",
+    "GCP_LOCATION",
+    "DASHBOARD_URL",
+    "ADMIN_CHAT_ID",
+    "GEMINI_MODEL",
+    "WEBHOOK_URL",
+    "WEBHOOK_PORT",
+    "PORT",
+    "DASHBOARD_PROXY_PORT",
+)
+
+# Snapshot of ENV_VARS; call refresh_env() after .env or credentials change
+ENV = types.SimpleNamespace()
+
+
+def refresh_env() -> types.SimpleNamespace:
+    """
+    Re-read ENV_VARS from os.environ into the shared ENV snapshot.
+
+    Updates ENV in place so modules holding a reference see new values.
+
+    Returns:
+        The ENV namespace
+    """
+    environ = os.environ
+    for var in ENV_VARS:
+        setattr(ENV, var, environ.get(var))
+    return ENV
+
+
+refresh_env()
+
+
+def _payload_digest(payload: str) -> str:
+    """Fingerprint a credentials payload for the setup sentinel."""
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _reuse_written_credentials(payload: str) -> bool:
+    """
+    Point GOOGLE_APPLICATION_CREDENTIALS at a previously written file.
+
+    Only succeeds if the sentinel says the same payload was already
+    written and the file is still there.
+    """
+    try:
+        with open(CREDS_SENTINEL_PATH) as f:
+            if f.read().strip() != _payload_digest(payload):
+                return False
+    except OSError:
+        return False
+
+    if not os.path.exists(TEMP_CREDS_PATH):
+        return False
+
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = TEMP_CREDS_PATH
+    return True
+
+
+def _mark_credentials_written(payload: str):
+    """Write the setup sentinel for the payload just materialized."""
+    try:
+        with open(CREDS_SENTINEL_PATH, "w") as f:
+            f.write(_payload_digest(payload))
+    except OSError:
+        pass
 
 
 def setup_google_credentials():
@@ -25,63 +114,74 @@ def setup_google_credentials():
     """
 
     # Method 1: File path (local development)
-    if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
-        creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    if creds_path:
         if os.path.exists(creds_path):
-            print(f"✓ Using Google credentials from file: {creds_path}")
+            log.info("✓ Using Google credentials from file: %s", creds_path)
             return True
         else:
-            print(f"⚠️  Credentials file not found: {creds_path}")
+            log.warning("⚠️  Credentials file not found: %s", creds_path)
 
     # Method 2: JSON string (Railway environment variable)
     creds_json_str = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
     if creds_json_str:
+        if _reuse_written_credentials(creds_json_str):
+            log.info("✓ Google credentials reused from previous setup")
+            return True
+
         try:
-            # Validate it's valid JSON
-            json.loads(creds_json_str)
+            # Validate it's valid JSON (the GCP client validates again on first use)
+            if os.getenv("VINEGAR_SKIP_CREDS_VALIDATE") != "1":
+                json.loads(creds_json_str)
 
             # Write to temporary file
-            temp_creds_path = "/tmp/gcp-credentials.json"
-            with open(temp_creds_path, "w") as f:
+            with open(TEMP_CREDS_PATH, "w") as f:
                 f.write(creds_json_str)
 
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = temp_creds_path
-            print(f"✓ Google credentials loaded from GOOGLE_APPLICATION_CREDENTIALS_JSON")
+            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = TEMP_CREDS_PATH
+            _mark_credentials_written(creds_json_str)
+            log.info("✓ Google credentials loaded from GOOGLE_APPLICATION_CREDENTIALS_JSON")
             return True
 
         except json.JSONDecodeError as e:
-            print(f"✗ Invalid JSON in GOOGLE_APPLICATION_CREDENTIALS_JSON: {e}")
+            log.error("✗ Invalid JSON in GOOGLE_APPLICATION_CREDENTIALS_JSON: %s", e)
             return False
 
     # Method 3: Base64 encoded JSON (Railway alternative)
     creds_base64 = os.getenv("GOOGLE_CREDENTIALS_BASE64")
     if creds_base64:
+        if _reuse_written_credentials(creds_base64):
+            log.info("✓ Google credentials reused from previous setup")
+            return True
+
         try:
-            # Decode base64
-            creds_json = base64.b64decode(creds_base64).decode('utf-8')
+            # Decode base64 straight to bytes (no intermediate str copy)
+            raw = base64.b64decode(creds_base64, validate=True)
 
-            # Validate it's valid JSON
-            json.loads(creds_json)
+            # Validate it's valid JSON (json.loads accepts UTF-8 bytes)
+            json.loads(raw)
 
             # Write to temporary file
-            temp_creds_path = "/tmp/gcp-credentials.json"
-            with open(temp_creds_path, "w") as f:
-                f.write(creds_json)
+            with open(TEMP_CREDS_PATH, "wb") as f:
+                f.write(raw)
 
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = temp_creds_path
-            print(f"✓ Google credentials loaded from GOOGLE_CREDENTIALS_BASE64")
+            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = TEMP_CREDS_PATH
+            _mark_credentials_written(creds_base64)
+            log.info("✓ Google credentials loaded from GOOGLE_CREDENTIALS_BASE64")
             return True
 
         except Exception as e:
-            print(f"✗ Error decoding GOOGLE_CREDENTIALS_BASE64: {e}")
+            log.error("✗ Error decoding GOOGLE_CREDENTIALS_BASE64: %s", e)
             return False
 
     # No credentials found
-    print("⚠️  No Google Cloud credentials found!")
-    print("Please set one of:")
-    print("  - GOOGLE_APPLICATION_CREDENTIALS (file path)")
-    print("  - GOOGLE_APPLICATION_CREDENTIALS_JSON (JSON string)")
-    print("  - GOOGLE_CREDENTIALS_BASE64 (base64 encoded)")
+    log.warning(
+        "⚠️  No Google Cloud credentials found!\n"
+        "Please set one of:\n"
+        "  - GOOGLE_APPLICATION_CREDENTIALS (file path)\n"
+        "  - GOOGLE_APPLICATION_CREDENTIALS_JSON (JSON string)\n"
+        "  - GOOGLE_CREDENTIALS_BASE64 (base64 encoded)"
+    )
     return False
 
 
@@ -89,14 +189,20 @@ def validate_environment():
     """
     Validate that all required environment variables are set.
 
+    Reads the ENV snapshot, so call refresh_env() first if the
+    environment changed. The result is cached until one of the required
+    variables changes.
+
     Returns:
         dict: Status of each required variable
     """
-    required_vars = {
-        "TELEGRAM_BOT_TOKEN": os.getenv("TELEGRAM_BOT_TOKEN"),
-        "GOOGLE_GEMINI_API_KEY": os.getenv("GOOGLE_GEMINI_API_KEY"),
-        "GOOGLE_CLOUD_PROJECT": os.getenv("GOOGLE_CLOUD_PROJECT"),
-    }
+    global _ENV_CACHE
+
+    required_vars = {var: getattr(ENV, var) for var in REQUIRED_VARS}
+    cache_key = tuple(required_vars.values())
+
+    if _ENV_CACHE is not None and _ENV_CACHE[0] == cache_key:
+        return _ENV_CACHE[1]
 
     status = {}
     all_present = True
@@ -108,11 +214,14 @@ def validate_environment():
             status[var] = "✗"
             all_present = False
 
-    return status, all_present
+    _ENV_CACHE = (cache_key, (status, all_present))
+    return _ENV_CACHE[1]
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("=" * 50)
     print("Configuration Check")
     print("=" * 50 + "\n")
@@ -120,6 +229,7 @@ if __name__ == "__main__":
     # Setup credentials
     print("1. Setting up Google Cloud credentials...")
     creds_ok = setup_google_credentials()
+    refresh_env()
 
     print("\n" + "=" * 50)
     print("2. Validating environment variables...")
@@ -5,66 +5,379 @@ SQLite database for storing post drafts, images, and user edits.
 """
 
 import sqlite3
+import logging
 import os
+import queue
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from urllib.parse import quote
+from typing import Optional, List, Dict, Any, Iterator
+
+log = logging.getLogger(__name__)
+
+# Number of read-only connections kept in the pool
+READ_POOL_SIZE = max(2, min(8, os.cpu_count() or 1))
+
+# Seconds acquire_read() waits for a pooled connection before giving up
+READ_TIMEOUT = 30
+
+# Per-connection settings (WAL lets readers run alongside the single writer)
+CONNECTION_PRAGMAS = """
+    PRAGMA foreign_keys = ON;
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -20000;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# Columns added to drafts after its first release, with their types;
+# older databases get them through ALTER TABLE at startup
+DRAFTS_ADDED_COLUMNS: Dict[str, str] = {
+    "scheduled_at": "TIMESTAMP",
+    "telegram_file_id": "TEXT",
+}
+
+# Emoji shown for each draft status (bot /status and the dashboard)
+STATUS_EMOJI: Dict[str, str] = {
+    "draft": "📝",
+    "approved": "✅",
+    "published": "🎉",
+    "rejected": "❌",
+}
+
+# Size of each connection's prepared-statement cache
+CACHED_STATEMENTS = 256
+
+# Canonical queries, shared by every connection so the statement cache hits
+_STATEMENTS: Dict[str, str] = {
+    "create_draft": """
+        INSERT INTO drafts (honey_type, post_text, image_path, telegram_message_id)
+        VALUES (?, ?, ?, ?)
+    """,
+    "get_draft": "SELECT * FROM drafts WHERE id = ?",
+    "get_draft_text": "SELECT post_text FROM drafts WHERE id = ?",
+    # Keyset pages for iter_drafts(): (created_at, id) is the cursor, so
+    # each page is an index seek and drafts sharing a timestamp keep an order
+    "get_all_drafts": """
+        SELECT * FROM drafts WHERE (created_at, id) < (?, ?)
+        ORDER BY created_at DESC, id DESC LIMIT ?
+    """,
+    "get_all_drafts_status": """
+        SELECT * FROM drafts WHERE status = ? AND (created_at, id) < (?, ?)
+        ORDER BY created_at DESC, id DESC LIMIT ?
+    """,
+    "get_all_drafts_asc": """
+        SELECT * FROM drafts WHERE (created_at, id) > (?, ?)
+        ORDER BY created_at ASC, id ASC LIMIT ?
+    """,
+    "get_all_drafts_status_asc": """
+        SELECT * FROM drafts WHERE status = ? AND (created_at, id) > (?, ?)
+        ORDER BY created_at ASC, id ASC LIMIT ?
+    """,
+    "list_drafts_lite": """
+        SELECT id, honey_type, status, created_at FROM drafts
+        ORDER BY created_at DESC LIMIT ?
+    """,
+    "list_drafts_lite_status": """
+        SELECT id, honey_type, status, created_at FROM drafts
+        WHERE status = ? ORDER BY created_at DESC LIMIT ?
+    """,
+    "update_text": """
+        UPDATE drafts
+        SET post_text = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """,
+    "insert_history": """
+        INSERT INTO edit_history (draft_id, old_text, new_text, edited_by)
+        SELECT id, post_text, ?, ? FROM drafts WHERE id = ?
+    """,
+    "update_status": """
+        UPDATE drafts
+        SET status = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """,
+    "update_image": """
+        UPDATE drafts
+        SET image_path = ?, telegram_file_id = NULL, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """,
+    "update_message_id": """
+        UPDATE drafts
+        SET telegram_message_id = ?, telegram_file_id = COALESCE(?, telegram_file_id)
+        WHERE id = ?
+    """,
+    "get_history": """
+        SELECT * FROM edit_history
+        WHERE draft_id = ?
+        ORDER BY edited_at DESC
+    """,
+    "delete_draft": "DELETE FROM drafts WHERE id = ?",
+    "get_latest": """
+        SELECT * FROM drafts
+        ORDER BY created_at DESC
+        LIMIT 1
+    """,
+}
+
+EDIT_HISTORY_DDL = """
+    CREATE TABLE IF NOT EXISTS edit_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        draft_id INTEGER NOT NULL,
+        old_text TEXT,
+        new_text TEXT,
+        edited_by TEXT DEFAULT 'user',
+        edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (draft_id) REFERENCES drafts(id) ON DELETE CASCADE
+    )
+"""
 
 
 class Database:
-    """Handles all database operations for the marketing agent."""
+    """
+    Handles all database operations for the marketing agent.
+
+    One open instance is kept per database file: constructing Database()
+    again for the same path returns the existing instance and its pool.
+    """
 
-    def __init__(self, db_path: str = "drafts.db"):
+    _instances: "weakref.WeakValueDictionary[str, Database]" = weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+
+    def __new__(cls, db_path: str = "drafts.db", read_pool_size: int = READ_POOL_SIZE):
+        key = os.path.abspath(db_path)
+
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                # Closed instances are removed from _instances by close()
+                instance = super().__new__(cls)
+                instance._initialized = False
+                cls._instances[key] = instance
+
+        return instance
+
+    def __init__(self, db_path: str = "drafts.db", read_pool_size: int = READ_POOL_SIZE):
         """
-        Initialize database connection.
+        Initialize database connections.
 
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Number of pooled read connections
         """
-        self.db_path = db_path
-        self.connection = None
+        # First-time setup runs under the class lock, so concurrent
+        # constructions for one path (e.g. two Streamlit sessions) open a
+        # single writer and pool, and none returns before they exist
+        with self._instances_lock:
+            if self._initialized:
+                return
+
+            self.db_path = db_path
+            self.read_pool_size = read_pool_size
+
+            # One writer (SQLite allows a single writer) plus a pool of readers
+            self._writer: Optional[sqlite3.Connection] = None
+            self._write_lock = threading.Lock()
+            self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+            self._stmts = _STATEMENTS
+
+            # Create database and tables if they don't exist
+            self.initialize_database()
+
+            self._initialized = True
+
+        log.info("✓ Database initialized: %s", db_path)
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a new connection with the shared settings applied."""
+        # Autocommit mode (isolation_level=None): acquire_write() manages BEGIN/COMMIT
+        connection = sqlite3.connect(
+            f"file:{quote(os.path.abspath(self.db_path))}?mode=rwc",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=CACHED_STATEMENTS
+        )
+        connection.row_factory = sqlite3.Row  # Return rows as dictionaries
+        connection.executescript(CONNECTION_PRAGMAS)
+        if read_only:
+            connection.execute("PRAGMA query_only = 1")
+        return connection
+
+    def _exec(self, connection: sqlite3.Connection, stmt_name: str, params=()) -> sqlite3.Cursor:
+        """Execute one of the canonical statements by name."""
+        return connection.execute(self._stmts[stmt_name], params)
+
+    @contextmanager
+    def acquire_read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool.
+
+        Usage:
+            with db.acquire_read() as connection:
+                connection.execute("SELECT ...")
 
-        # Create database and tables if they don't exist
-        self.initialize_database()
+        Raises:
+            sqlite3.OperationalError: If no connection frees up within
+                READ_TIMEOUT seconds
+        """
+        try:
+            connection = self._readers.get(timeout=READ_TIMEOUT)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"no read connection free after {READ_TIMEOUT}s "
+                f"(pool size {self.read_pool_size})"
+            ) from None
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    @contextmanager
+    def acquire_write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the writer connection inside a transaction (commit or rollback).
 
-        print(f"✓ Database initialized: {db_path}")
+        Usage:
+            with db.acquire_write() as connection:
+                connection.execute("UPDATE ...")
+
+        BEGIN IMMEDIATE takes SQLite's write lock up front instead of
+        upgrading a deferred read transaction, which can fail with
+        SQLITE_BUSY when another process holds the lock.
+        """
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
 
     def initialize_database(self):
-        """Create database tables if they don't exist."""
-        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.connection.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """Create database tables if they don't exist and open the pool."""
+        self._writer = self._connect()
+
+        with self.acquire_write() as connection:
+            cursor = connection.cursor()
+
+            # Create drafts table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS drafts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    honey_type TEXT NOT NULL,
+                    post_text TEXT NOT NULL,
+                    image_path TEXT,
+                    status TEXT DEFAULT 'draft',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    published_at TIMESTAMP,
+                    telegram_message_id INTEGER,
+                    notes TEXT,
+                    scheduled_at TIMESTAMP,
+                    telegram_file_id TEXT
+                )
+            """)
+            self._migrate_drafts_columns(cursor)
+
+            # Create edit history table
+            cursor.execute(EDIT_HISTORY_DDL)
+            self._migrate_edit_history_cascade(cursor)
+
+            # Indices backing the ORDER BY listings and per-draft history
+            # lookups; id breaks created_at ties for iter_drafts() paging
+            cursor.execute("DROP INDEX IF EXISTS idx_drafts_status_created")
+            cursor.execute("DROP INDEX IF EXISTS idx_drafts_created")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_drafts_status_created_id
+                ON drafts(status, created_at DESC, id DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_drafts_created_id
+                ON drafts(created_at DESC, id DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_history_draft_time
+                ON edit_history(draft_id, edited_at DESC)
+            """)
+
+            # Partial index over pending schedules only; (status, scheduled_at)
+            # serves the scheduler's due-posts range scan in time order
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_drafts_scheduled
+                ON drafts(status, scheduled_at) WHERE scheduled_at IS NOT NULL
+            """)
+
+        # Readers are opened after all DDL so their statement caches never
+        # hold plans compiled against an older schema
+        for _ in range(self.read_pool_size):
+            self._readers.put(self._connect(read_only=True))
+
+        if os.getenv("VINEGAR_SQL_AUDIT") == "1":
+            self.audit_query_plans()
+
+    def audit_query_plans(self) -> List[tuple]:
+        """
+        Check that every canonical statement is planned against an index.
 
-        cursor = self.connection.cursor()
+        Runs EXPLAIN QUERY PLAN for each entry in the statement table and
+        logs plan steps that scan a table without an index or sort in a
+        temporary b-tree. Enabled at startup with VINEGAR_SQL_AUDIT=1.
 
-        # Create drafts table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS drafts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                honey_type TEXT NOT NULL,
-                post_text TEXT NOT NULL,
-                image_path TEXT,
-                status TEXT DEFAULT 'draft',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                published_at TIMESTAMP,
-                telegram_message_id INTEGER,
-                notes TEXT
-            )
-        """)
+        Returns:
+            List of (statement name, plan detail) for each offending step
+        """
+        offenders = []
+
+        with self.acquire_read() as connection:
+            for name, sql in self._stmts.items():
+                params = (None,) * sql.count("?")
+                plan = connection.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+
+                for row in plan:
+                    detail = row["detail"]
+                    full_scan = detail.startswith("SCAN") and "USING" not in detail
+                    if full_scan or "TEMP B-TREE" in detail:
+                        offenders.append((name, detail))
+                        log.warning("⚠️  Query '%s' is not using an index: %s", name, detail)
+
+        if not offenders:
+            log.info("✓ All canonical queries use indices")
+
+        return offenders
+
+    def _migrate_drafts_columns(self, cursor: sqlite3.Cursor):
+        """Add columns to drafts tables created before those columns existed."""
+        columns = {row["name"] for row in cursor.execute("PRAGMA table_info(drafts)")}
+
+        for name, column_type in DRAFTS_ADDED_COLUMNS.items():
+            if name in columns:
+                continue
+
+            cursor.execute(f"ALTER TABLE drafts ADD COLUMN {name} {column_type}")
+            log.info("✓ Migrated drafts: added %s column", name)
+
+    def _migrate_edit_history_cascade(self, cursor: sqlite3.Cursor):
+        """Rebuild edit_history if it predates the ON DELETE CASCADE foreign key."""
+        foreign_keys = cursor.execute("PRAGMA foreign_key_list(edit_history)").fetchall()
+        if all(fk["on_delete"] == "CASCADE" for fk in foreign_keys):
+            return
 
-        # Create edit history table
+        cursor.execute("ALTER TABLE edit_history RENAME TO edit_history_old")
+        cursor.execute(EDIT_HISTORY_DDL)
+
+        # History of already-deleted drafts would violate the enforced key
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS edit_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                draft_id INTEGER NOT NULL,
-                old_text TEXT,
-                new_text TEXT,
-                edited_by TEXT DEFAULT 'user',
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (draft_id) REFERENCES drafts(id)
-            )
+            INSERT INTO edit_history
+            SELECT * FROM edit_history_old
+            WHERE draft_id IN (SELECT id FROM drafts)
         """)
+        cursor.execute("DROP TABLE edit_history_old")
 
-        self.connection.commit()
+        log.info("✓ Migrated edit_history to ON DELETE CASCADE")
 
     def create_draft(
         self,
@@ -85,20 +398,44 @@ class Database:
         Returns:
             Draft ID
         """
-        cursor = self.connection.cursor()
-
-        cursor.execute("""
-            INSERT INTO drafts (honey_type, post_text, image_path, telegram_message_id)
-            VALUES (?, ?, ?, ?)
-        """, (honey_type, post_text, image_path, telegram_message_id))
-
-        self.connection.commit()
+        with self.acquire_write() as connection:
+            cursor = self._exec(
+                connection,
+                "create_draft",
+                (honey_type, post_text, image_path, telegram_message_id)
+            )
 
         draft_id = cursor.lastrowid
-        print(f"✓ Draft created with ID: {draft_id}")
+        log.debug("✓ Draft created with ID: %d", draft_id)
 
         return draft_id
 
+    def create_drafts_bulk(self, rows: List[tuple]) -> List[int]:
+        """
+        Create many drafts in a single write transaction.
+
+        Args:
+            rows: (honey_type, post_text, image_path, telegram_message_id) tuples
+
+        Returns:
+            Draft IDs, in the same order as rows
+        """
+        if not rows:
+            return []
+
+        # One transaction (and one commit) covers every row
+        with self.acquire_write() as connection:
+            cursor = connection.executemany(self._stmts["create_draft"], rows)
+
+            # The writer is exclusive inside this transaction, so the
+            # AUTOINCREMENT ids of this batch are contiguous
+            last_id = connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        first_id = last_id - cursor.rowcount + 1
+        log.debug("✓ %d drafts created (IDs %d-%d)", cursor.rowcount, first_id, last_id)
+
+        return list(range(first_id, last_id + 1))
+
     def get_draft(self, draft_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a specific draft by ID.
@@ -109,15 +446,75 @@ class Database:
         Returns:
             Draft data as dictionary, or None if not found
         """
-        cursor = self.connection.cursor()
-
-        cursor.execute("SELECT * FROM drafts WHERE id = ?", (draft_id,))
-        row = cursor.fetchone()
+        with self.acquire_read() as connection:
+            row = self._exec(connection, "get_draft", (draft_id,)).fetchone()
 
         if row:
             return dict(row)
         return None
 
+    def get_draft_text(self, draft_id: int) -> Optional[str]:
+        """
+        Get only a draft's post text.
+
+        Cheaper than get_draft() when the caller needs nothing else: one
+        column is read and no dict is built.
+
+        Args:
+            draft_id: Draft ID
+
+        Returns:
+            Post text, or None if the draft doesn't exist
+        """
+        with self.acquire_read() as connection:
+            row = self._exec(connection, "get_draft_text", (draft_id,)).fetchone()
+
+        return row[0] if row else None
+
+    def iter_drafts(
+        self,
+        status: Optional[str] = None,
+        batch: int = 256,
+        oldest_first: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream drafts in batches, optionally filtered by status.
+
+        Each batch is a keyset query on its own borrowed read connection,
+        which goes back to the pool before any row is yielded, so callers
+        may run other queries (or stop early) while iterating.
+
+        Args:
+            status: Filter by status ('draft', 'approved', 'published')
+            batch: Number of rows fetched per query
+            oldest_first: Yield the oldest drafts first instead of the newest
+
+        Yields:
+            Drafts as dictionaries, newest first (unless oldest_first)
+        """
+        stmt_name = "get_all_drafts" + ("_status" if status else "")
+        filters = (status,) if status else ()
+
+        # Start the keyset before the first row: "" sorts below and
+        # "9999-12-31" above every CURRENT_TIMESTAMP value
+        if oldest_first:
+            stmt_name += "_asc"
+            key = ("", 0)
+        else:
+            key = ("9999-12-31", 0)
+
+        while True:
+            params = (*filters, *key, batch)
+            with self.acquire_read() as connection:
+                rows = self._exec(connection, stmt_name, params).fetchall()
+
+            for row in rows:
+                yield dict(row)
+
+            if len(rows) < batch:
+                break
+            key = (rows[-1]["created_at"], rows[-1]["id"])
+
     def get_all_drafts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get all drafts, optionally filtered by status.
@@ -128,18 +525,32 @@ class Database:
         Returns:
             List of drafts
         """
-        cursor = self.connection.cursor()
+        return list(self.iter_drafts(status))
 
-        if status:
-            cursor.execute(
-                "SELECT * FROM drafts WHERE status = ? ORDER BY created_at DESC",
-                (status,)
-            )
-        else:
-            cursor.execute("SELECT * FROM drafts ORDER BY created_at DESC")
+    def list_drafts_lite(self, status: Optional[str] = None, limit: int = -1) -> List[tuple]:
+        """
+        List drafts as plain (id, honey_type, status, created_at) tuples.
 
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+        Cheaper than get_all_drafts() for listings and counters: only four
+        columns are read and no per-row dict is built.
+
+        Args:
+            status: Filter by status ('draft', 'approved', 'published')
+            limit: Maximum number of rows (default: -1, no limit)
+
+        Returns:
+            List of (id, honey_type, status, created_at) tuples, newest first
+        """
+        with self.acquire_read() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = None  # Plain tuples instead of sqlite3.Row
+
+            if status:
+                cursor.execute(self._stmts["list_drafts_lite_status"], (status, limit))
+            else:
+                cursor.execute(self._stmts["list_drafts_lite"], (limit,))
+
+            return cursor.fetchall()
 
     def update_draft_text(self, draft_id: int, new_text: str, edited_by: str = "user") -> bool:
         """
@@ -153,32 +564,23 @@ class Database:
         Returns:
             True if successful
         """
-        cursor = self.connection.cursor()
-
-        # Get old text first
-        draft = self.get_draft(draft_id)
-        if not draft:
-            print(f"✗ Draft {draft_id} not found")
-            return False
-
-        old_text = draft["post_text"]
-
-        # Update draft
-        cursor.execute("""
-            UPDATE drafts
-            SET post_text = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (new_text, draft_id))
+        with self.acquire_write() as connection:
+            # Record in edit history, copying the old text straight from the
+            # row (UPDATE ... RETURNING only sees the new value)
+            cursor = self._exec(
+                connection,
+                "insert_history",
+                (new_text, edited_by, draft_id)
+            )
 
-        # Record in edit history
-        cursor.execute("""
-            INSERT INTO edit_history (draft_id, old_text, new_text, edited_by)
-            VALUES (?, ?, ?, ?)
-        """, (draft_id, old_text, new_text, edited_by))
+            if cursor.rowcount == 0:
+                log.warning("✗ Draft %d not found", draft_id)
+                return False
 
-        self.connection.commit()
+            # Update draft
+            self._exec(connection, "update_text", (new_text, draft_id))
 
-        print(f"✓ Draft {draft_id} updated")
+        log.debug("✓ Draft %d updated", draft_id)
         return True
 
     def update_draft_status(self, draft_id: int, status: str) -> bool:
@@ -192,17 +594,10 @@ class Database:
         Returns:
             True if successful
         """
-        cursor = self.connection.cursor()
-
-        cursor.execute("""
-            UPDATE drafts
-            SET status = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (status, draft_id))
+        with self.acquire_write() as connection:
+            self._exec(connection, "update_status", (status, draft_id))
 
-        self.connection.commit()
-
-        print(f"✓ Draft {draft_id} status updated to: {status}")
+        log.debug("✓ Draft %d status updated to: %s", draft_id, status)
         return True
 
     def update_draft_image(self, draft_id: int, new_image_path: str) -> bool:
@@ -216,18 +611,70 @@ class Database:
         Returns:
             True if successful
         """
-        cursor = self.connection.cursor()
+        with self.acquire_write() as connection:
+            self._exec(connection, "update_image", (new_image_path, draft_id))
 
-        cursor.execute("""
-            UPDATE drafts
-            SET image_path = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (new_image_path, draft_id))
+        log.debug("✓ Draft %d image updated", draft_id)
+        return True
 
-        self.connection.commit()
+    def update_draft_message_id(
+        self,
+        draft_id: int,
+        telegram_message_id: int,
+        telegram_file_id: Optional[str] = None
+    ) -> bool:
+        """
+        Record the Telegram message a draft was sent as.
 
-        print(f"✓ Draft {draft_id} image updated")
-        return True
+        Args:
+            draft_id: Draft ID
+            telegram_message_id: Telegram message ID
+            telegram_file_id: Telegram file_id of the uploaded photo, so the
+                              same image can be re-sent without uploading it
+                              again (kept unchanged if None)
+
+        Returns:
+            True if a draft was updated
+        """
+        params = (telegram_message_id, telegram_file_id, draft_id)
+        with self.acquire_write() as connection:
+            cursor = self._exec(connection, "update_message_id", params)
+
+        return cursor.rowcount > 0
+
+    def publish_drafts(self, draft_ids: List[int]) -> List[int]:
+        """
+        Mark several approved drafts as published in one transaction.
+
+        Args:
+            draft_ids: Draft IDs to publish
+
+        Returns:
+            IDs that were actually published (drafts not found or not
+            approved are skipped)
+        """
+        if not draft_ids:
+            return []
+
+        placeholders = ",".join("?" * len(draft_ids))
+
+        # One statement for the whole batch; RETURNING reports which rows
+        # actually changed
+        with self.acquire_write() as connection:
+            rows = connection.execute(
+                f"""
+                UPDATE drafts
+                SET status = 'published', published_at = CURRENT_TIMESTAMP, scheduled_at = NULL
+                WHERE id IN ({placeholders}) AND status = 'approved'
+                RETURNING id
+                """,
+                draft_ids
+            ).fetchall()
+
+        published = [row[0] for row in rows]
+
+        log.debug("✓ Drafts published: %s", published)
+        return published
 
     def get_edit_history(self, draft_id: int) -> List[Dict[str, Any]]:
         """
@@ -239,20 +686,14 @@ class Database:
         Returns:
             List of edits
         """
-        cursor = self.connection.cursor()
-
-        cursor.execute("""
-            SELECT * FROM edit_history
-            WHERE draft_id = ?
-            ORDER BY edited_at DESC
-        """, (draft_id,))
+        with self.acquire_read() as connection:
+            rows = self._exec(connection, "get_history", (draft_id,)).fetchall()
 
-        rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
     def delete_draft(self, draft_id: int) -> bool:
         """
-        Delete a draft and its edit history.
+        Delete a draft; its edit history goes with it via ON DELETE CASCADE.
 
         Args:
             draft_id: Draft ID
@@ -260,17 +701,10 @@ class Database:
         Returns:
             True if successful
         """
-        cursor = self.connection.cursor()
-
-        # Delete edit history first (foreign key)
-        cursor.execute("DELETE FROM edit_history WHERE draft_id = ?", (draft_id,))
-
-        # Delete draft
-        cursor.execute("DELETE FROM drafts WHERE id = ?", (draft_id,))
-
-        self.connection.commit()
+        with self.acquire_write() as connection:
+            self._exec(connection, "delete_draft", (draft_id,))
 
-        print(f"✓ Draft {draft_id} deleted")
+        log.debug("✓ Draft %d deleted", draft_id)
         return True
 
     def get_latest_draft(self) -> Optional[Dict[str, Any]]:
@@ -280,29 +714,37 @@ class Database:
         Returns:
             Latest draft or None
         """
-        cursor = self.connection.cursor()
-
-        cursor.execute("""
-            SELECT * FROM drafts
-            ORDER BY created_at DESC
-            LIMIT 1
-        """)
-
-        row = cursor.fetchone()
+        with self.acquire_read() as connection:
+            row = self._exec(connection, "get_latest").fetchone()
 
         if row:
             return dict(row)
         return None
 
     def close(self):
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
-            print("✓ Database connection closed")
+        """Close the writer and all pooled read connections."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+            with self._instances_lock:
+                key = os.path.abspath(self.db_path)
+                if self._instances.get(key) is self:
+                    del self._instances[key]
+
+            log.info("✓ Database connection closed")
 
 
 # Example usage and testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     print("=" * 50)
     print("Database Module Test")
     print("=" * 50 + "\n")
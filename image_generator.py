@@ -7,10 +7,33 @@ Supports generating high-quality, realistic product photos for organic honey mar
 
 import os
 import base64
-from typing import Optional
-from google.cloud import aiplatform
-from google.cloud.aiplatform.gapic.schema import predict
-from vertexai.preview.vision_models import ImageGenerationModel
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Imagen model version used for product photos
+IMAGEN_MODEL = "imagegeneration@006"
+
+
+@lru_cache(maxsize=4)
+def _load_imagen_model(project_id: str, location: str, version: str):
+    """
+    Import Vertex AI and load an Imagen model, once per (project, location, version).
+
+    The SDK pulls in grpc/protobuf and takes seconds to import, and
+    from_pretrained costs a round-trip to GCP, so both are deferred until
+    an image is actually requested and then cached.
+    """
+    from google.cloud import aiplatform
+    from vertexai.preview.vision_models import ImageGenerationModel
+
+    aiplatform.init(project=project_id, location=location)
+
+    log.info("🎨 Loading Imagen model %s...", version)
+    return ImageGenerationModel.from_pretrained(version)
 
 
 class ImageGenerator:
@@ -27,37 +50,82 @@ class ImageGenerator:
         self.project_id = project_id
         self.location = location
 
-        # Initialize Vertex AI
-        aiplatform.init(project=project_id, location=location)
+        # Vertex AI SDK and Imagen model are loaded on first use (see _get_model)
 
-        print(f"✓ Image Generator initialized (Project: {project_id}, Location: {location})")
+        log.info("✓ Image Generator initialized (Project: %s, Location: %s)", project_id, location)
 
-    def generate_honey_product_image(
+    def _get_model(self, version: str = IMAGEN_MODEL):
+        """Get the (cached) Imagen model for this project and location."""
+        return _load_imagen_model(self.project_id, self.location, version)
+
+    def _write_image(self, image, output_path: str) -> str:
+        """
+        Write the SDK's already-encoded PNG bytes straight to disk.
+
+        Avoids image.save(), which re-encodes through PIL and buffers a copy.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+        fd = os.open(output_path, flags, 0o644)
+        try:
+            data = memoryview(image._image_bytes)
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+        finally:
+            os.close(fd)
+
+        return output_path
+
+    def _image_paths(self, output_path: str, count: int) -> List[str]:
+        """First image keeps output_path; extra ones get a _1, _2, ... suffix."""
+        stem, ext = os.path.splitext(output_path)
+        return [output_path] + [f"{stem}_{i}{ext or '.png'}" for i in range(1, count)]
+
+    def generate_product_images(
         self,
         prompt: str,
         negative_prompt: str = "low quality, blurry, distorted, text, watermark",
         number_of_images: int = 1,
-        output_path: str = "generated_image.png"
-    ) -> Optional[str]:
+        output_path: str = "generated_image.png",
+        model_version: str = IMAGEN_MODEL
+    ) -> List[str]:
         """
-        Generate a product image using Imagen.
+        Generate product images using Imagen and save all of them.
 
         Args:
             prompt: Text description of the desired image (in English)
             negative_prompt: What to avoid in the image
             number_of_images: Number of images to generate (default: 1)
-            output_path: Where to save the generated image
+            output_path: Where to save the first image; extra images get a
+                         numeric suffix (generated_image_1.png, ...)
+            model_version: Imagen model version (default: IMAGEN_MODEL)
 
         Returns:
-            Path to the saved image file, or None if generation failed
+            Paths of the saved image files (empty if generation failed)
+        """
+        images = self._generate_images(prompt, negative_prompt, number_of_images, output_path, model_version)
+        return [path for path, _ in images]
+
+    def _generate_images(
+        self,
+        prompt: str,
+        negative_prompt: str,
+        number_of_images: int,
+        output_path: str,
+        model_version: str
+    ) -> List[Tuple[str, bytes]]:
+        """
+        Generate images with Imagen and save them (see generate_product_images).
+
+        Returns:
+            (path, PNG bytes) of each saved image (empty if generation failed)
         """
         try:
-            # Load the Imagen model
-            print(f"🎨 Loading Imagen model...")
-            model = ImageGenerationModel.from_pretrained("imagegeneration@006")
+            # Load the Imagen model (cached after the first call)
+            model = self._get_model(model_version)
 
             # Generate images
-            print(f"🎨 Generating image with prompt: {prompt[:100]}...")
+            log.info("🎨 Generating image with prompt: %.100s...", prompt)
 
             response = model.generate_images(
                 prompt=prompt,
@@ -68,36 +136,75 @@ class ImageGenerator:
                 person_generation="allow_adult",
             )
 
-            # Save the first generated image
-            if response.images:
-                image = response.images[0]
+            if not response.images:
+                log.warning("✗ No images were generated by Imagen")
+                return []
 
-                # Ensure output directory exists
-                import os
-                os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
 
-                # Save to file
-                image.save(location=output_path, include_generation_parameters=False)
+            # Save every generated image; writes are independent and release the GIL
+            images = response.images
+            targets = self._image_paths(output_path, len(images))
 
-                # Verify file was created
-                if os.path.exists(output_path):
-                    print(f"✓ Image saved to: {output_path} ({os.path.getsize(output_path)} bytes)")
-                    return output_path
-                else:
-                    print(f"✗ Image file was not created: {output_path}")
-                    return None
+            if len(images) == 1:
+                paths = [self._write_image(images[0], targets[0])]
             else:
-                print("✗ No images were generated by Imagen")
-                return None
+                with ThreadPoolExecutor(max_workers=min(4, len(images))) as pool:
+                    paths = list(pool.map(self._write_image, images, targets))
+
+            # Verify files were created
+            saved = []
+            for path, image in zip(paths, images):
+                if os.path.exists(path):
+                    log.info("✓ Image saved to: %s (%d bytes)", path, os.path.getsize(path))
+                    saved.append((path, image._image_bytes))
+                else:
+                    log.error("✗ Image file was not created: %s", path)
+
+            return saved
 
         except Exception as e:
-            import traceback
-            print(f"✗ Error generating image: {type(e).__name__}: {str(e)}")
-            print(f"✗ Full traceback:")
-            traceback.print_exc()
-            return None
+            log.exception("✗ Error generating image: %s: %s", type(e).__name__, e)
+            return []
+
+    def generate_honey_product_image(
+        self,
+        prompt: str,
+        negative_prompt: str = "low quality, blurry, distorted, text, watermark",
+        number_of_images: int = 1,
+        output_path: str = "generated_image.png",
+        model_version: str = IMAGEN_MODEL
+    ) -> Optional[str]:
+        """
+        Generate a product image using Imagen.
 
-    def generate_honey_marketing_image(self, honey_type: str = "ბროწეულის ძმარი") -> Optional[str]:
+        Saves all requested images (see generate_product_images) and returns
+        the first one.
+
+        Args:
+            prompt: Text description of the desired image (in English)
+            negative_prompt: What to avoid in the image
+            number_of_images: Number of images to generate (default: 1)
+            output_path: Where to save the generated image
+            model_version: Imagen model version (default: IMAGEN_MODEL)
+
+        Returns:
+            Path to the saved image file, or None if generation failed
+        """
+        paths = self.generate_product_images(
+            prompt=prompt,
+            negative_prompt=negative_prompt,
+            number_of_images=number_of_images,
+            output_path=output_path,
+            model_version=model_version
+        )
+        return paths[0] if paths else None
+
+    def generate_honey_marketing_image(
+        self,
+        honey_type: str = "ბროწეულის ძმარი"
+    ) -> Tuple[Optional[str], Optional[bytes]]:
         """
         Generate a marketing image specifically for honey products.
 
@@ -105,7 +212,9 @@ class ImageGenerator:
             honey_type: Type of honey in Georgian (e.g., "ბროწეულის ძმარი")
 
         Returns:
-            Path to the saved image file
+            (path to the saved image file, its PNG bytes), so callers can
+            send the image without reading the file back; (None, None) if
+            generation failed
         """
         # Create a detailed prompt in English (Imagen works best with English)
         prompt = f"""
@@ -123,16 +232,20 @@ class ImageGenerator:
 
         output_path = f"honey_product_{honey_type.replace(' ', '_')}.png"
 
-        return self.generate_honey_product_image(
-            prompt=prompt.strip(),
-            negative_prompt=negative_prompt.strip(),
-            output_path=output_path
+        images = self._generate_images(
+            prompt.strip(),
+            negative_prompt.strip(),
+            number_of_images=1,
+            output_path=output_path,
+            model_version=IMAGEN_MODEL
         )
+        return images[0] if images else (None, None)
 
 
 # Example usage and testing
 if __name__ == "__main__":
     # This is for testing only - normally called from main.py
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     # Get credentials from environment
     project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
@@ -145,7 +258,7 @@ if __name__ == "__main__":
         generator = ImageGenerator(project_id=project_id)
 
         # Generate a test image
-        result = generator.generate_honey_marketing_image("ბროწეულის ძმარი")
+        result, _ = generator.generate_honey_marketing_image("ბროწეულის ძმარი")
 
         if result:
             print(f"\n✓ Success! Image generated: {result}")
@@ -10,16 +10,46 @@ License: MIT
 
 import os
 import sys
-import threading
+import queue
+import asyncio
+import atexit
+import logging
+import logging.handlers
 from dotenv import load_dotenv
 
 # Import our modules
-from config import setup_google_credentials, validate_environment
+from config import ENV, refresh_env, setup_google_credentials, validate_environment
 from database import Database
 from text_generator import TextGenerator
 from image_generator import ImageGenerator
 from scheduler import PostScheduler
-from telegram_bot import MarketingBot
+from telegram_bot import MarketingBot, WEBHOOK_PORT
+
+
+def setup_logging():
+    """
+    Configure application logging (level from LOG_LEVEL, default INFO).
+
+    Records are put on a queue by the calling thread and formatted/written
+    to stderr by a single QueueListener thread, so the scheduler and bot
+    handler threads never wait on the stream lock.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The listener's handler does the real formatting
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        handlers=[queue_handler]
+    )
 
 
 def load_environment():
@@ -27,10 +57,16 @@ def load_environment():
     # Load .env file if it exists
     load_dotenv()
 
+    # Configure logging now that LOG_LEVEL may have come from .env
+    setup_logging()
+
     # Setup Google Cloud credentials (Railway-compatible)
     print("\n🔐 Setting up Google Cloud credentials...")
     creds_ok = setup_google_credentials()
 
+    # Snapshot the environment once (.env and credentials are now in place)
+    refresh_env()
+
     if not creds_ok:
         print("\n⚠️  Google Cloud credentials not configured properly.")
         print("Image generation will not work without credentials.")
@@ -72,21 +108,21 @@ def initialize_components():
     # Initialize text generator (Gemini)
     print("\n2️⃣ Initializing Google Gemini text generator...")
     text_gen = TextGenerator(
-        api_key=os.getenv("GOOGLE_GEMINI_API_KEY"),
-        model_name=os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+        api_key=ENV.GOOGLE_GEMINI_API_KEY,
+        model_name=ENV.GEMINI_MODEL or "gemini-1.5-flash"
     )
 
     # Initialize image generator (Vertex AI Imagen)
     print("\n3️⃣ Initializing Google Vertex AI image generator...")
 
     # Check for Google Cloud credentials
-    credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    credentials_path = ENV.GOOGLE_APPLICATION_CREDENTIALS
     if credentials_path and not os.path.exists(credentials_path):
         print(f"⚠️  Warning: Credentials file not found: {credentials_path}")
 
     image_gen = ImageGenerator(
-        project_id=os.getenv("GOOGLE_CLOUD_PROJECT"),
-        location=os.getenv("GCP_LOCATION", "us-central1")
+        project_id=ENV.GOOGLE_CLOUD_PROJECT,
+        location=ENV.GCP_LOCATION or "us-central1"
     )
 
     # Initialize scheduler
@@ -97,12 +133,13 @@ def initialize_components():
     # Initialize Telegram bot
     print("\n5️⃣ Initializing Telegram bot...")
     bot = MarketingBot(
-        bot_token=os.getenv("TELEGRAM_BOT_TOKEN"),
+        bot_token=ENV.TELEGRAM_BOT_TOKEN,
         database=db,
         text_generator=text_gen,
         image_generator=image_gen,
         scheduler=scheduler,
-        admin_chat_id=os.getenv("ADMIN_CHAT_ID")  # Optional
+        admin_chat_id=ENV.ADMIN_CHAT_ID,  # Optional
+        dashboard_url=ENV.DASHBOARD_URL
     )
 
     print("\n" + "=" * 50)
@@ -112,13 +149,31 @@ def initialize_components():
     return db, text_gen, image_gen, scheduler, bot
 
 
+def run_async(coro):
+    """Run a coroutine on a new event loop, using uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    return uvloop.run(coro)
+
+
 def run_telegram_bot(bot: MarketingBot):
-    """Run Telegram bot in a separate thread."""
+    """
+    Run the Telegram bot on an event loop in the calling (main) thread.
+
+    Uses a webhook when WEBHOOK_URL is set, long polling otherwise.
+    """
     try:
-        bot.start_polling()
+        if ENV.WEBHOOK_URL:
+            port = int(ENV.WEBHOOK_PORT or ENV.PORT or WEBHOOK_PORT)
+            dashboard_port = int(ENV.DASHBOARD_PROXY_PORT) if ENV.DASHBOARD_PROXY_PORT else None
+            run_async(bot.start_webhook(ENV.WEBHOOK_URL, port, dashboard_port))
+        else:
+            run_async(bot.start_polling())
     except KeyboardInterrupt:
         print("\n⏸️  Stopping Telegram bot...")
-        bot.stop()
     except Exception as e:
         print(f"\n❌ Telegram bot error: {e}")
 
@@ -145,9 +200,9 @@ def main():
     print("\n📋 Application Information:")
     print(f"   • Database: {db.db_path}")
     print(f"   • Gemini Model: {text_gen.model_name}")
-    print(f"   • GCP Project: {os.getenv('GOOGLE_CLOUD_PROJECT')}")
-    print(f"   • GCP Location: {os.getenv('GCP_LOCATION', 'us-central1')}")
-    print(f"   • Dashboard URL: {os.getenv('DASHBOARD_URL', 'http://localhost:8501')}")
+    print(f"   • GCP Project: {ENV.GOOGLE_CLOUD_PROJECT}")
+    print(f"   • GCP Location: {ENV.GCP_LOCATION or 'us-central1'}")
+    print(f"   • Dashboard URL: {ENV.DASHBOARD_URL or 'http://localhost:8501'}")
 
     print("\n🎯 How to use:")
     print("   1. Open Telegram and find your bot")
@@ -164,11 +219,14 @@ def main():
     print("=" * 50)
     print("\n💡 Press Ctrl+C to stop\n")
 
-    # Run bot
+    # Run bot; run_telegram_bot() handles Ctrl+C itself, so clean up in
+    # finally rather than in an except clause that would never run
     try:
         run_telegram_bot(bot)
-    except KeyboardInterrupt:
+    finally:
         print("\n\n👋 Shutting down gracefully...")
+        scheduler.stop_scheduler()
+        print("✅ Scheduler stopped")
         db.close()
         print("✅ Database closed")
         print("✅ Application stopped")
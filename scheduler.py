@@ -4,30 +4,109 @@ Post Scheduler for Social Media Marketing Agent
 Handles scheduling posts for future publication and immediate publishing.
 """
 
-import os
 import time
+import heapq
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Tuple
 from database import Database
 import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+
+# Upper bound on how long the loop sleeps, so schedules written by other
+# processes (or posts approved after their time) are still picked up
+POLL_INTERVAL = 60.0
+
+# Maximum number of due posts published per loop iteration
+DEFAULT_BATCH_SIZE = 100
+
+# SQL used by the scheduler. Kept as constants so each statement is one
+# identical string and always hits the connection's statement cache.
+_SQL_LOAD_SCHEDULE = (
+    "SELECT id, scheduled_at FROM drafts "
+    "WHERE status = 'approved' AND scheduled_at IS NOT NULL"
+)
+_SQL_DUE_POSTS = (
+    "SELECT id FROM drafts "
+    "WHERE status = 'approved' AND scheduled_at IS NOT NULL AND scheduled_at <= ? "
+    "ORDER BY scheduled_at LIMIT ?"
+)
+_SQL_SCHEDULE = "UPDATE drafts SET scheduled_at = ? WHERE id = ? AND status = 'approved'"
+_SQL_CANCEL = "UPDATE drafts SET scheduled_at = NULL WHERE id = ? AND scheduled_at IS NOT NULL"
+_SQL_PUBLISH = (
+    "UPDATE drafts SET status = 'published', published_at = CURRENT_TIMESTAMP, "
+    "scheduled_at = NULL WHERE id = ? AND status = 'approved' "
+    "RETURNING post_text, image_path, telegram_file_id"
+)
+
+
+def _to_db_time(value: float) -> str:
+    """Format a POSIX timestamp the way scheduled_at is stored (local time)."""
+    return datetime.fromtimestamp(value).isoformat(sep=" ", timespec="seconds")
 
 
 class PostScheduler:
-    """Manages post scheduling and publishing."""
+    """
+    Manages post scheduling and publishing.
+
+    The drafts.scheduled_at column is the source of truth: the loop
+    publishes whatever the database says is due. scheduled_posts and the
+    heap are an in-memory index of the same data, loaded once at startup,
+    used to know when to wake up.
+    """
 
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, batch_size: int = DEFAULT_BATCH_SIZE):
         """
         Initialize the Post Scheduler.
 
         Args:
             database: Database instance
+            batch_size: Maximum number of due posts published per iteration
         """
         self.db = database
-        self.scheduled_posts = {}  # {draft_id: scheduled_datetime}
+        self.batch_size = batch_size
+        self.scheduled_posts: Dict[int, datetime] = {}  # {draft_id: scheduled_datetime}
+
+        # Read-only live view handed out by get_scheduled_posts()
+        self._schedule_view = MappingProxyType(self.scheduled_posts)
+
+        # Min-heap of (POSIX timestamp, draft_id). Entries whose time no
+        # longer matches scheduled_posts (cancelled/rescheduled) are stale
+        # and skipped when popped. Times are wall-clock (time.time()), not
+        # monotonic, because schedules are wall-clock times.
+        self._heap: List[Tuple[float, int]] = []
+
+        # Guards scheduled_posts and _heap, which are touched from bot
+        # handler threads and the scheduler thread. Held only around the
+        # in-memory updates, never across SQL.
+        self._sched_lock = threading.Lock()
+
+        # Set to wake the scheduler thread early (new schedule, cancel, stop)
+        self._wake = threading.Event()
+
+        # Set to make the scheduler thread exit (see stop_scheduler)
+        self._stop = threading.Event()
+
         self.scheduler_thread = None
-        self.running = False
 
-        print("✓ Post Scheduler initialized")
+        self._load_schedule()
+
+        log.info("✓ Post Scheduler initialized")
+
+    def _load_schedule(self):
+        """Load pending schedules from the database into the in-memory index."""
+        with self.db.acquire_read() as connection:
+            rows = connection.execute(_SQL_LOAD_SCHEDULE).fetchall()
+
+        for draft_id, scheduled_at in rows:
+            scheduled_time = datetime.fromisoformat(scheduled_at)
+            self.scheduled_posts[draft_id] = scheduled_time
+            self._heap.append((scheduled_time.timestamp(), draft_id))
+
+        heapq.heapify(self._heap)
 
     def schedule_post(self, draft_id: int, publish_datetime: datetime) -> bool:
         """
@@ -41,31 +120,30 @@ class PostScheduler:
             True if scheduled successfully
         """
         try:
-            draft = self.db.get_draft(draft_id)
-
-            if not draft:
-                print(f"✗ Draft {draft_id} not found")
+            scheduled_ts = publish_datetime.timestamp()
+
+            # Persist the schedule (survives restarts); the status check is
+            # part of the UPDATE, so there is no separate read beforehand
+            with self.db.acquire_write() as connection:
+                cursor = connection.execute(_SQL_SCHEDULE, (_to_db_time(scheduled_ts), draft_id))
+
+            if cursor.rowcount == 0:
+                if self._draft_exists(draft_id):
+                    log.warning("✗ Draft %d must be approved before scheduling", draft_id)
+                else:
+                    log.warning("✗ Draft %d not found", draft_id)
                 return False
 
-            if draft['status'] != 'approved':
-                print(f"✗ Draft {draft_id} must be approved before scheduling")
-                return False
-
-            # Store in memory (in production, this should be in database)
-            self.scheduled_posts[draft_id] = publish_datetime
-
-            # Update database with schedule info
-            self.db.connection.execute(
-                "UPDATE drafts SET notes = ? WHERE id = ?",
-                (f"Scheduled for: {publish_datetime.strftime('%Y-%m-%d %H:%M')}", draft_id)
-            )
-            self.db.connection.commit()
+            with self._sched_lock:
+                self.scheduled_posts[draft_id] = publish_datetime
+                heapq.heappush(self._heap, (scheduled_ts, draft_id))
+            self._wake.set()
 
-            print(f"✓ Draft {draft_id} scheduled for {publish_datetime.strftime('%Y-%m-%d %H:%M')}")
+            log.info("✓ Draft %d scheduled for %s", draft_id, publish_datetime.strftime('%Y-%m-%d %H:%M'))
             return True
 
         except Exception as e:
-            print(f"✗ Error scheduling post: {e}")
+            log.error("✗ Error scheduling post: %s", e, exc_info=True)
             return False
 
     def publish_now(self, draft_id: int) -> Dict[str, Any]:
@@ -79,44 +157,46 @@ class PostScheduler:
             Dict with success status and details
         """
         try:
-            draft = self.db.get_draft(draft_id)
-
-            if not draft:
+            # Update status to published (and drop any pending schedule)
+            # only if the draft is approved
+            with self.db.acquire_write() as connection:
+                draft = connection.execute(_SQL_PUBLISH, (draft_id,)).fetchone()
+
+            if draft is None:
+                if self._draft_exists(draft_id):
+                    error = "Draft must be approved before publishing"
+                else:
+                    error = "Draft not found"
                 return {
                     "success": False,
-                    "error": "Draft not found"
+                    "error": error
                 }
 
-            if draft['status'] != 'approved':
-                return {
-                    "success": False,
-                    "error": "Draft must be approved before publishing"
-                }
+            with self._sched_lock:
+                self.scheduled_posts.pop(draft_id, None)
 
-            # Update status to published
-            self.db.connection.execute(
-                "UPDATE drafts SET status = ?, published_at = CURRENT_TIMESTAMP WHERE id = ?",
-                ('published', draft_id)
-            )
-            self.db.connection.commit()
-
-            print(f"✅ Draft {draft_id} published successfully!")
+            log.info("✅ Draft %d published successfully!", draft_id)
 
             return {
                 "success": True,
                 "draft_id": draft_id,
                 "post_text": draft['post_text'],
                 "image_path": draft['image_path'],
+                "telegram_file_id": draft['telegram_file_id'],
                 "published_at": datetime.now().isoformat()
             }
 
         except Exception as e:
-            print(f"✗ Error publishing post: {e}")
+            log.error("✗ Error publishing post: %s", e, exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
             }
 
+    def _draft_exists(self, draft_id: int) -> bool:
+        """Tell "not found" from "not approved" after a conditional UPDATE matched nothing."""
+        return self.db.get_draft_text(draft_id) is not None
+
     def cancel_schedule(self, draft_id: int) -> bool:
         """
         Cancel a scheduled post.
@@ -127,92 +207,134 @@ class PostScheduler:
         Returns:
             True if cancelled successfully
         """
-        if draft_id in self.scheduled_posts:
-            del self.scheduled_posts[draft_id]
+        with self.db.acquire_write() as connection:
+            cursor = connection.execute(_SQL_CANCEL, (draft_id,))
 
-            # Update database
-            self.db.connection.execute(
-                "UPDATE drafts SET notes = NULL WHERE id = ?",
-                (draft_id,)
-            )
-            self.db.connection.commit()
+        if cursor.rowcount:
+            # Its heap entry is now stale and will be skipped
+            with self._sched_lock:
+                self.scheduled_posts.pop(draft_id, None)
+            self._wake.set()
 
-            print(f"✓ Schedule cancelled for draft {draft_id}")
+            log.info("✓ Schedule cancelled for draft %d", draft_id)
             return True
         else:
-            print(f"✗ No schedule found for draft {draft_id}")
+            log.warning("✗ No schedule found for draft %d", draft_id)
             return False
 
-    def get_scheduled_posts(self) -> Dict[int, datetime]:
+    def get_scheduled_posts(self) -> Mapping[int, datetime]:
         """
         Get all scheduled posts.
 
         Returns:
-            Dict of {draft_id: scheduled_datetime}
+            Read-only live view of {draft_id: scheduled_datetime}; take
+            dict(...) of it for a snapshot
         """
-        return self.scheduled_posts.copy()
+        return self._schedule_view
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler thread has been started and not stopped."""
+        return self.scheduler_thread is not None and not self._stop.is_set()
 
     def start_scheduler(self):
         """Start the background scheduler thread."""
         if self.running:
-            print("⚠️  Scheduler is already running")
+            log.warning("⚠️  Scheduler is already running")
             return
 
-        self.running = True
+        self._stop.clear()
         self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self.scheduler_thread.start()
 
-        print("✓ Scheduler thread started")
+        log.info("✓ Scheduler thread started")
 
     def stop_scheduler(self):
-        """Stop the background scheduler thread."""
-        self.running = False
+        """Stop the background scheduler thread and wait for it to exit."""
+        self._stop.set()
+        self._wake.set()  # Interrupt the current wait right away
         if self.scheduler_thread:
-            self.scheduler_thread.join(timeout=5)
+            self.scheduler_thread.join()
+            self.scheduler_thread = None
+
+        log.info("✓ Scheduler thread stopped")
+
+    def _pop_due_posts(self, now: float):
+        """Drop every heap entry scheduled at or before now from the in-memory index."""
+        with self._sched_lock:
+            while self._heap and self._heap[0][0] <= now:
+                scheduled_ts, draft_id = heapq.heappop(self._heap)
+                scheduled_time = self.scheduled_posts.get(draft_id)
+                if scheduled_time is not None and scheduled_time.timestamp() == scheduled_ts:
+                    del self.scheduled_posts[draft_id]
+
+    def _fetch_due_posts(self, now: float) -> List[int]:
+        """Query the database for approved posts whose time has come."""
+        with self.db.acquire_read() as connection:
+            rows = connection.execute(_SQL_DUE_POSTS, (_to_db_time(now), self.batch_size)).fetchall()
+
+        return [row[0] for row in rows]
 
-        print("✓ Scheduler thread stopped")
+    def _seconds_until_next(self) -> float:
+        """Seconds until the earliest heap entry is due, capped at POLL_INTERVAL."""
+        with self._sched_lock:
+            if not self._heap:
+                return POLL_INTERVAL
+            next_ts = self._heap[0][0]
+
+        delay = next_ts - time.time()
+        return min(max(0.0, delay), POLL_INTERVAL)
 
     def _scheduler_loop(self):
-        """Background loop that checks for posts to publish."""
-        print("🔄 Scheduler loop started")
+        """Background loop that publishes posts as they become due."""
+        log.info("🔄 Scheduler loop started")
 
-        while self.running:
+        while not self._stop.is_set():
             try:
-                now = datetime.now()
+                # Clear before reading the heap so a concurrent schedule_post()
+                # either is seen below or wakes the wait at the bottom
+                self._wake.clear()
+
+                now = time.time()
+                self._pop_due_posts(now)
 
-                # Check for posts that need to be published
-                posts_to_publish = []
+                # The database decides what is due
+                posts_to_publish = self._fetch_due_posts(now)
 
-                for draft_id, scheduled_time in list(self.scheduled_posts.items()):
-                    if now >= scheduled_time:
-                        posts_to_publish.append(draft_id)
+                # Publish all due posts in one transaction (one commit per tick)
+                if posts_to_publish:
+                    log.info("⏰ Publishing %d scheduled posts...", len(posts_to_publish))
+                    published = self.db.publish_drafts(posts_to_publish)
 
-                # Publish due posts
-                for draft_id in posts_to_publish:
-                    print(f"⏰ Publishing scheduled post {draft_id}...")
-                    result = self.publish_now(draft_id)
+                    # Their heap entries (if any) become stale and are skipped
+                    with self._sched_lock:
+                        for draft_id in published:
+                            self.scheduled_posts.pop(draft_id, None)
 
-                    if result['success']:
-                        # Remove from schedule
-                        del self.scheduled_posts[draft_id]
-                        print(f"✅ Scheduled post {draft_id} published!")
-                    else:
-                        print(f"✗ Failed to publish scheduled post {draft_id}: {result.get('error')}")
+                    if log.isEnabledFor(logging.INFO):
+                        for draft_id in published:
+                            log.info("✅ Scheduled post %d published!", draft_id)
 
-                # Sleep for 60 seconds before next check
-                time.sleep(60)
+                    # A full batch means more posts may already be due
+                    if len(posts_to_publish) == self.batch_size:
+                        continue
+
+                # Sleep until the next post is due, or until woken
+                self._wake.wait(timeout=self._seconds_until_next())
 
             except Exception as e:
-                print(f"✗ Error in scheduler loop: {e}")
-                time.sleep(60)
+                log.error("✗ Error in scheduler loop: %s", e, exc_info=True)
+                self._wake.wait(timeout=POLL_INTERVAL)
 
-        print("🔄 Scheduler loop stopped")
+        log.info("🔄 Scheduler loop stopped")
 
 
 # Example usage
 if __name__ == "__main__":
     from database import Database
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     db = Database("test_drafts.db")
     scheduler = PostScheduler(db)
 
@@ -230,7 +352,7 @@ if __name__ == "__main__":
     future_time = datetime.now() + timedelta(minutes=5)
     scheduler.schedule_post(draft_id, future_time)
 
-    print(f"\nScheduled posts: {scheduler.get_scheduled_posts()}")
+    print(f"\nScheduled posts: {dict(scheduler.get_scheduled_posts())}")
 
     # Or publish immediately
     # result = scheduler.publish_now(draft_id)
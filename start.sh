@@ -4,10 +4,19 @@
 
 echo "🚀 Starting Social Media Marketing Agent on Railway..."
 
+# In webhook mode the bot listens on $PORT (the only routed port) and
+# forwards every non-webhook request to the dashboard on an internal port
+DASHBOARD_PORT=$PORT
+if [ -n "$WEBHOOK_URL" ] && [ -z "$WEBHOOK_PORT" ]; then
+    DASHBOARD_PORT=8501
+    [ "$PORT" = "8501" ] && DASHBOARD_PORT=8502
+    export DASHBOARD_PROXY_PORT=$DASHBOARD_PORT
+fi
+
 # Start Streamlit dashboard in background
-echo "📊 Starting Streamlit dashboard on port $PORT..."
+echo "📊 Starting Streamlit dashboard on port $DASHBOARD_PORT..."
 streamlit run streamlit_dashboard.py \
-    --server.port=$PORT \
+    --server.port=$DASHBOARD_PORT \
     --server.address=0.0.0.0 \
     --server.headless=true \
     --browser.gatherUsageStats=false &
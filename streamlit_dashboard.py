@@ -7,7 +7,8 @@ Allows manual editing of Georgian text before publishing.
 
 import streamlit as st
 import os
-from database import Database
+from itertools import chain
+from database import Database, STATUS_EMOJI
 from text_generator import TextGenerator
 from PIL import Image
 
@@ -80,9 +81,9 @@ def main():
 
         # Quick stats
         st.subheader("📊 სწრაფი სტატისტიკა")
-        all_drafts = db.get_all_drafts()
-        draft_count = len([d for d in all_drafts if d['status'] == 'draft'])
-        approved_count = len([d for d in all_drafts if d['status'] == 'approved'])
+        all_drafts = db.list_drafts_lite()
+        draft_count = sum(1 for d in all_drafts if d[2] == 'draft')
+        approved_count = sum(1 for d in all_drafts if d[2] == 'approved')
 
         st.metric("დრაფტები", draft_count)
         st.metric("დამტკიცებული", approved_count)
@@ -121,93 +122,94 @@ def show_drafts_page(db: Database):
     with col2:
         sort_order = st.selectbox("დალაგება:", ["ახალი პირველი", "ძველი პირველი"])
 
-    # Get drafts
-    if status_filter == "ყველა":
-        drafts = db.get_all_drafts()
-    else:
-        drafts = db.get_all_drafts(status=status_filter)
+    # Stream drafts from SQLite instead of loading them all at once
+    drafts = db.iter_drafts(
+        status=None if status_filter == "ყველა" else status_filter,
+        oldest_first=(sort_order == "ძველი პირველი")
+    )
 
-    if sort_order == "ძველი პირველი":
-        drafts = list(reversed(drafts))
+    first = next(drafts, None)
 
-    if not drafts:
+    if first is None:
         st.info("📭 დრაფტები არ არის.")
         return
 
     # Display drafts
-    for draft in drafts:
-        # Highlight if this is the selected draft
-        is_selected = (selected_draft_id == draft['id'])
-
-        with st.expander(
-            f"{'🔹' if is_selected else '📄'} #{draft['id']} - {draft['honey_type']} ({draft['status']})",
-            expanded=is_selected
-        ):
-            col1, col2 = st.columns([2, 1])
-
-            with col1:
-                # Editable text area
-                new_text = st.text_area(
-                    "ტექსტი:",
-                    value=draft['post_text'],
-                    height=200,
-                    key=f"text_{draft['id']}"
-                )
-
-                # Save button
-                if st.button(f"💾 ტექსტის შენახვა", key=f"save_{draft['id']}"):
-                    if new_text != draft['post_text']:
-                        db.update_draft_text(draft['id'], new_text, edited_by="user")
-                        st.success("✓ ტექსტი შენახულია!")
-                        st.rerun()
-
-                # Status update
-                col_a, col_b, col_c = st.columns(3)
-
-                with col_a:
-                    if st.button("✅ დამტკიცება", key=f"approve_{draft['id']}"):
-                        db.update_draft_status(draft['id'], "approved")
-                        st.success("დამტკიცებულია!")
-                        st.rerun()
-
-                with col_b:
-                    if st.button("❌ უარყოფა", key=f"reject_{draft['id']}"):
-                        db.update_draft_status(draft['id'], "rejected")
-                        st.warning("უარყოფილია!")
-                        st.rerun()
-
-                with col_c:
-                    if st.button("🗑️ წაშლა", key=f"delete_{draft['id']}"):
-                        db.delete_draft(draft['id'])
-                        st.success("წაშლილია!")
-                        st.rerun()
-
-            with col2:
-                # Display image if available
-                if draft['image_path'] and os.path.exists(draft['image_path']):
-                    try:
-                        image = Image.open(draft['image_path'])
-                        st.image(image, caption=f"#{draft['id']}", use_container_width=True)
-                    except Exception as e:
-                        st.error(f"სურათის ჩატვირთვა ვერ მოხერხდა: {e}")
-                else:
-                    st.info("📷 სურათი არ არის")
-
-                # Metadata
-                st.caption(f"**შექმნილია:** {draft['created_at'][:16]}")
-                st.caption(f"**განახლებულია:** {draft['updated_at'][:16]}")
-
-            # Show edit history
-            if st.checkbox(f"📜 რედაქტირების ისტორია", key=f"history_{draft['id']}"):
-                history = db.get_edit_history(draft['id'])
-
-                if history:
-                    for edit in history:
-                        st.caption(
-                            f"✏️ {edit['edited_at'][:16]} - {edit['edited_by']}"
-                        )
-                else:
-                    st.caption("ისტორია ცარიელია")
+    for draft in chain((first,), drafts):
+        show_draft(db, draft, is_selected=(selected_draft_id == draft['id']))
+
+
+def show_draft(db: Database, draft: dict, is_selected: bool):
+    """Show one draft with its editor, actions, image and history."""
+    with st.expander(
+        f"{'🔹' if is_selected else '📄'} #{draft['id']} - {draft['honey_type']} ({draft['status']})",
+        expanded=is_selected
+    ):
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            # Editable text area
+            new_text = st.text_area(
+                "ტექსტი:",
+                value=draft['post_text'],
+                height=200,
+                key=f"text_{draft['id']}"
+            )
+
+            # Save button
+            if st.button(f"💾 ტექსტის შენახვა", key=f"save_{draft['id']}"):
+                if new_text != draft['post_text']:
+                    db.update_draft_text(draft['id'], new_text, edited_by="user")
+                    st.success("✓ ტექსტი შენახულია!")
+                    st.rerun()
+
+            # Status update
+            col_a, col_b, col_c = st.columns(3)
+
+            with col_a:
+                if st.button("✅ დამტკიცება", key=f"approve_{draft['id']}"):
+                    db.update_draft_status(draft['id'], "approved")
+                    st.success("დამტკიცებულია!")
+                    st.rerun()
+
+            with col_b:
+                if st.button("❌ უარყოფა", key=f"reject_{draft['id']}"):
+                    db.update_draft_status(draft['id'], "rejected")
+                    st.warning("უარყოფილია!")
+                    st.rerun()
+
+            with col_c:
+                if st.button("🗑️ წაშლა", key=f"delete_{draft['id']}"):
+                    db.delete_draft(draft['id'])
+                    st.success("წაშლილია!")
+                    st.rerun()
+
+        with col2:
+            # Display image if available
+            if draft['image_path'] and os.path.exists(draft['image_path']):
+                try:
+                    image = Image.open(draft['image_path'])
+                    st.image(image, caption=f"#{draft['id']}", use_container_width=True)
+                except Exception as e:
+                    st.error(f"სურათის ჩატვირთვა ვერ მოხერხდა: {e}")
+            else:
+                st.info("📷 სურათი არ არის")
+
+            # Metadata
+            st.caption(f"**შექმნილია:** {draft['created_at'][:16]}")
+            st.caption(f"**განახლებულია:** {draft['updated_at'][:16]}")
+
+        # Show edit history
+        if st.checkbox(f"📜 რედაქტირების ისტორია", key=f"history_{draft['id']}"):
+            history = db.get_edit_history(draft['id'])
+
+            if history:
+                for edit in history:
+                    st.caption(
+                        f"✏️ {edit['edited_at'][:16]} - {edit['edited_by']}"
+                    )
+            else:
+                st.caption("ისტორია ცარიელია")
 
 
 def show_create_page(db: Database):
@@ -244,7 +246,8 @@ def show_statistics_page(db: Database):
     """Show statistics and analytics."""
     st.header("📊 სტატისტიკა")
 
-    all_drafts = db.get_all_drafts()
+    # (id, honey_type, status, created_at) tuples
+    all_drafts = db.list_drafts_lite()
 
     if not all_drafts:
         st.info("📭 მონაცემები არ არის.")
@@ -254,19 +257,19 @@ def show_statistics_page(db: Database):
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        draft_count = len([d for d in all_drafts if d['status'] == 'draft'])
+        draft_count = sum(1 for d in all_drafts if d[2] == 'draft')
         st.metric("📝 დრაფტები", draft_count)
 
     with col2:
-        approved_count = len([d for d in all_drafts if d['status'] == 'approved'])
+        approved_count = sum(1 for d in all_drafts if d[2] == 'approved')
         st.metric("✅ დამტკიცებული", approved_count)
 
     with col3:
-        published_count = len([d for d in all_drafts if d['status'] == 'published'])
+        published_count = sum(1 for d in all_drafts if d[2] == 'published')
         st.metric("🎉 გამოქვეყნებული", published_count)
 
     with col4:
-        rejected_count = len([d for d in all_drafts if d['status'] == 'rejected'])
+        rejected_count = sum(1 for d in all_drafts if d[2] == 'rejected')
         st.metric("❌ უარყოფილი", rejected_count)
 
     st.divider()
@@ -276,17 +279,12 @@ def show_statistics_page(db: Database):
 
     recent_drafts = all_drafts[:10]
 
-    for draft in recent_drafts:
-        status_emoji = {
-            'draft': '📝',
-            'approved': '✅',
-            'published': '🎉',
-            'rejected': '❌'
-        }.get(draft['status'], '❓')
+    for draft_id, honey_type, status, created_at in recent_drafts:
+        status_emoji = STATUS_EMOJI.get(status, '❓')
 
         st.caption(
-            f"{status_emoji} **#{draft['id']}** - {draft['honey_type']} "
-            f"({draft['created_at'][:16]})"
+            f"{status_emoji} **#{draft_id}** - {honey_type} "
+            f"({created_at[:16]})"
         )
 
     st.divider()
@@ -295,8 +293,7 @@ def show_statistics_page(db: Database):
     st.subheader("🍯 ძმრის ტიპები")
 
     honey_types = {}
-    for draft in all_drafts:
-        honey_type = draft['honey_type']
+    for _, honey_type, _, _ in all_drafts:
         honey_types[honey_type] = honey_types.get(honey_type, 0) + 1
 
     for honey_type, count in sorted(honey_types.items(), key=lambda x: x[1], reverse=True):
@@ -6,15 +6,158 @@ Sends generated posts (photo + text) and allows approval, regeneration, or editi
 """
 
 import os
-import telebot
+import hmac
+import json
+import time
+import secrets
+import asyncio
+import logging
+from functools import lru_cache, partial
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+from aiohttp import web
 from telebot import types
-from typing import Optional, Callable
+from telebot.async_telebot import AsyncTeleBot
+from typing import Optional, Callable, Dict, Any
 from datetime import datetime, timedelta
-from database import Database
+from database import Database, STATUS_EMOJI
 from text_generator import TextGenerator
 from image_generator import ImageGenerator
 from scheduler import PostScheduler
 
+log = logging.getLogger(__name__)
+
+
+# Threads for blocking image generation calls (Imagen SDK)
+GENERATION_WORKERS = 4
+
+# Maximum number of drafts kept in the callback lookup cache
+DRAFT_CACHE_SIZE = 128
+
+# Seconds a cached draft row is trusted; the dashboard edits drafts from
+# another process, which never invalidates the bot's cache
+DRAFT_CACHE_TTL = 30
+
+# Outgoing Bot API calls allowed per second; Telegram caps bots at about
+# 30 messages per second, so stay just under it
+SEND_RATE_LIMIT = 28
+
+# Maximum number of outgoing Bot API calls in flight at once
+SEND_CONCURRENCY = 25
+
+# Fallback port for the webhook server when neither WEBHOOK_PORT nor the
+# platform's PORT is set (see start_webhook); TLS is terminated in front
+# of it by the hosting platform
+WEBHOOK_PORT = 8443
+
+# Path Telegram POSTs updates to in webhook mode
+WEBHOOK_PATH = "/webhook"
+
+# Header carrying the secret_token registered with set_webhook
+WEBHOOK_SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Connection-scoped headers the dashboard proxy must not forward (RFC 7230)
+HOP_BY_HOP_HEADERS = frozenset((
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+))
+
+# Chunk size for streaming proxied dashboard responses
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Caption edits for the same message within this many seconds are
+# coalesced; only the last one is sent
+EDIT_DEBOUNCE = 0.05
+
+# Number of drafts listed by /status
+STATUS_LIMIT = 10
+
+# Review keyboard, serialized once; "{id}" is replaced with the draft ID.
+# telebot sends a str reply_markup as-is, so no InlineKeyboardButton
+# objects are built per message.
+REVIEW_MARKUP_TEMPLATE = json.dumps({
+    "inline_keyboard": [
+        [
+            {"text": "✅ დადასტურება", "callback_data": "approve_{id}"},
+            {"text": "❌ უარყოფა", "callback_data": "reject_{id}"}
+        ],
+        [
+            {"text": "🔄 ტექსტის შეცვლა", "callback_data": "regenerate_text_{id}"},
+            {"text": "🎨 ფოტოს შეცვლა", "callback_data": "regenerate_image_{id}"}
+        ],
+        [
+            {"text": "✏️ დაშბორდზე რედაქტირება", "callback_data": "edit_{id}"}
+        ]
+    ]
+}, ensure_ascii=False)
+
+# Publish options shown after approval; same "{id}" convention. Schedule
+# buttons carry the delay as "schedule:<hours>:<draft_id>".
+PUBLISH_MARKUP_TEMPLATE = json.dumps({
+    "inline_keyboard": [
+        [{"text": "🚀 დაუყოვნებლივ გამოქვეყნება", "callback_data": "publish_now_{id}"}],
+        [{"text": "📅 დაგეგმვა (1 საათში)", "callback_data": "schedule:1:{id}"}],
+        [{"text": "📅 დაგეგმვა (3 საათში)", "callback_data": "schedule:3:{id}"}],
+        [{"text": "📅 დაგეგმვა (ხვალ)", "callback_data": "schedule:24:{id}"}],
+        [{"text": "◀️ უკან", "callback_data": "back_to_edit_{id}"}]
+    ]
+}, ensure_ascii=False)
+
+
+@lru_cache(maxsize=1024)
+def _review_markup(draft_id: int) -> str:
+    """Review keyboard JSON for a draft (memoized)."""
+    return REVIEW_MARKUP_TEMPLATE.replace("{id}", str(draft_id))
+
+
+@lru_cache(maxsize=1024)
+def _publish_markup(draft_id: int) -> str:
+    """Publish-options keyboard JSON for a draft (memoized)."""
+    return PUBLISH_MARKUP_TEMPLATE.replace("{id}", str(draft_id))
+
+
+def _photo_file_id(message) -> Optional[str]:
+    """Telegram file_id of the largest size of a sent photo, if any."""
+    # Sizes are listed smallest first
+    return message.photo[-1].file_id if message.photo else None
+
+
+class _SendThrottle:
+    """
+    Rate limiter for outgoing Bot API calls (async context manager).
+
+    Keeps the start times of the calls made in the last second; a call
+    that would exceed `rate` waits until the oldest one leaves the window.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: int, concurrency: int):
+        self.rate = rate
+        self._slots = asyncio.Semaphore(concurrency)
+        self._window: deque = deque()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    while self._window and now - self._window[0] >= 1.0:
+                        self._window.popleft()
+                    if len(self._window) < self.rate:
+                        break
+                    await asyncio.sleep(1.0 - (now - self._window[0]))
+
+                self._window.append(now)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self._slots.release()
+
 
 class MarketingBot:
     """Telegram bot for social media marketing workflow."""
@@ -26,7 +169,8 @@ class MarketingBot:
         text_generator: TextGenerator,
         image_generator: ImageGenerator,
         scheduler: PostScheduler,
-        admin_chat_id: Optional[int] = None
+        admin_chat_id: Optional[int] = None,
+        dashboard_url: Optional[str] = None
     ):
         """
         Initialize the Telegram bot.
@@ -38,27 +182,78 @@ class MarketingBot:
             image_generator: Image generator instance
             scheduler: Post scheduler instance
             admin_chat_id: Chat ID of the admin user (optional)
+            dashboard_url: Streamlit dashboard URL (default: DASHBOARD_URL env var)
         """
-        self.bot = telebot.TeleBot(bot_token)
+        # Handlers are coroutines; each update is processed in its own task,
+        # so a slow /create never holds up other chats
+        self.bot = AsyncTeleBot(bot_token)
         self.db = database
         self.text_gen = text_generator
         self.image_gen = image_generator
         self.scheduler = scheduler
         self.admin_chat_id = admin_chat_id
-
-        # Store current draft ID for callback context
-        self.current_draft_id = None
+        self.dashboard_url = dashboard_url or os.getenv("DASHBOARD_URL", "http://localhost:8501")
+
+        # Bounded pool for the blocking Imagen SDK calls
+        self._gen_pool = ThreadPoolExecutor(max_workers=GENERATION_WORKERS, thread_name_prefix="gen")
+
+        # Small LRU of (expiry, draft row) read by callback handlers;
+        # entries are dropped whenever the bot itself modifies a draft and
+        # expire after DRAFT_CACHE_TTL. Only touched from the event loop,
+        # so no lock is needed.
+        self._draft_cache = OrderedDict()
+
+        # Callback action -> handler(message, draft_id)
+        self._callback_actions = {
+            "approve": self._approve_draft,
+            "reject": self._reject_draft,
+            "publish_now": self._publish_now,
+            # Legacy schedule buttons on messages sent before "schedule:<hours>:<id>"
+            "schedule_1h": partial(self._schedule_post, hours=1),
+            "schedule_3h": partial(self._schedule_post, hours=3),
+            "schedule_tomorrow": partial(self._schedule_post, hours=24),
+            "back_to_edit": self._back_to_edit,
+            "regenerate_text": self._regenerate_text,
+            "regenerate_image": self._regenerate_image,
+            "edit": self._open_dashboard,
+        }
+
+        # Per-chat callback queues and the task draining each one; a
+        # worker exits (and both entries are removed) once its queue is empty
+        self._chat_queues: Dict[int, asyncio.Queue] = {}
+        self._chat_workers: Dict[int, asyncio.Task] = {}
+
+        # Telegram file_id of already uploaded photos, keyed by file identity
+        self._photo_file_ids: Dict[tuple, str] = {}
+
+        # Paces every message send/edit/delete (see _api)
+        self._send_throttle = _SendThrottle(SEND_RATE_LIMIT, SEND_CONCURRENCY)
+
+        # Debounced caption edits by (chat_id, message_id): waiting out the
+        # debounce (cancellable), and being sent (awaited by the next one)
+        self._pending_edits: Dict[tuple, asyncio.Task] = {}
+        self._sending_edits: Dict[tuple, asyncio.Task] = {}
+
+        # Webhook mode: secret Telegram echoes in every request
+        self._webhook_secret = secrets.token_urlsafe(32)
+
+        # Fire-and-forget tasks in flight (referenced so they are not
+        # collected before they finish); see _spawn
+        self._background_tasks = set()
+
+        # Draft identity travels in each button's callback_data
+        # ("<action>_<draft_id>"); no per-chat state is kept on the bot
 
         # Register handlers
         self._register_handlers()
 
-        print("✓ Telegram Bot initialized")
+        log.info("✓ Telegram Bot initialized")
 
     def _register_handlers(self):
         """Register all bot command and callback handlers."""
 
         @self.bot.message_handler(commands=['start', 'help'])
-        def send_welcome(message):
+        async def send_welcome(message):
             """Welcome message."""
             welcome_text = """
 👋 გამარჯობა! მე ვარ სოციალური მედიის მარკეტინგის აგენტი.
@@ -70,16 +265,17 @@ class MarketingBot:
 
 🍯 მაგალითი: /create ბროწეულის ძმარი
 """
-            self.bot.reply_to(message, welcome_text)
+            await self._api(self.bot.reply_to, message, welcome_text)
 
         @self.bot.message_handler(commands=['create'])
-        def create_post(message):
+        async def create_post(message):
             """Create a new marketing post."""
             # Parse honey type from command
             parts = message.text.split(maxsplit=1)
 
             if len(parts) < 2:
-                self.bot.reply_to(
+                await self._api(
+                    self.bot.reply_to,
                     message,
                     "❌ გთხოვ, მიუთითე ძმრის ტიპი.\n\nმაგალითი: /create ბროწეულის ძმარი"
                 )
@@ -88,231 +284,397 @@ class MarketingBot:
             honey_type = parts[1]
 
             # Send "processing" message
-            processing_msg = self.bot.reply_to(
+            processing_msg = await self._api(
+                self.bot.reply_to,
                 message,
                 f"⏳ ვქმნი პოსტს {honey_type}-ის შესახებ...\n\n"
                 "🎨 ვაგენერირებ სურათს...\n"
                 "📝 ვწერ ტექსტს..."
             )
 
-            try:
-                # Generate image
-                image_path = self.image_gen.generate_honey_marketing_image(honey_type)
-
-                if not image_path:
-                    self.bot.edit_message_text(
-                        "❌ სურათის გენერაცია ვერ მოხერხდა. გთხოვ, სცადე თავიდან.",
-                        message.chat.id,
-                        processing_msg.message_id
-                    )
-                    return
-
-                # Generate text
-                post_text = self.text_gen.generate_facebook_post(
-                    honey_type=honey_type,
-                    tone="friendly",
-                    include_emoji=True
-                )
-
-                if not post_text:
-                    self.bot.edit_message_text(
-                        "❌ ტექსტის გენერაცია ვერ მოხერხდა. გთხოვ, სცადე თავიდან.",
-                        message.chat.id,
-                        processing_msg.message_id
-                    )
-                    return
-
-                # Delete processing message
-                self.bot.delete_message(message.chat.id, processing_msg.message_id)
-
-                # Send the complete post
-                self._send_post_for_review(message.chat.id, honey_type, post_text, image_path)
-
-            except Exception as e:
-                self.bot.edit_message_text(
-                    f"❌ შეცდომა: {str(e)}",
-                    message.chat.id,
-                    processing_msg.message_id
-                )
+            await self._do_generate(message.chat.id, processing_msg.message_id, honey_type)
 
         @self.bot.message_handler(commands=['status'])
-        def show_status(message):
+        async def show_status(message):
             """Show status of all drafts."""
-            drafts = self.db.get_all_drafts()
+            drafts = await self._run_db(self.db.list_drafts_lite, limit=STATUS_LIMIT)
 
             if not drafts:
-                self.bot.reply_to(message, "📭 დრაფტები არ არის.")
+                await self._api(self.bot.reply_to, message, "📭 დრაფტები არ არის.")
                 return
 
-            status_text = "📊 დრაფტების სტატუსი:\n\n"
-
-            for draft in drafts[:10]:  # Show last 10
-                status_emoji = {
-                    'draft': '📝',
-                    'approved': '✅',
-                    'published': '🎉',
-                    'rejected': '❌'
-                }.get(draft['status'], '❓')
+            parts = ["📊 დრაფტების სტატუსი:\n\n"]
 
-                status_text += (
-                    f"{status_emoji} #{draft['id']} - {draft['honey_type']}\n"
-                    f"   სტატუსი: {draft['status']}\n"
-                    f"   შექმნილია: {draft['created_at'][:16]}\n\n"
+            for draft_id, honey_type, status, created_at in drafts:
+                parts.append(
+                    f"{STATUS_EMOJI.get(status, '❓')} #{draft_id} - {honey_type}\n"
+                    f"   სტატუსი: {status}\n"
+                    f"   შექმნილია: {created_at[:16]}\n\n"
                 )
 
-            self.bot.reply_to(message, status_text)
+            await self._api(self.bot.reply_to, message, "".join(parts))
 
         @self.bot.callback_query_handler(func=lambda call: True)
-        def handle_callback(call):
+        async def handle_callback(call):
             """Handle inline button callbacks."""
-            action = call.data
-
-            if action.startswith("approve_"):
-                draft_id = int(action.split("_")[1])
-                self._approve_draft(call.message, draft_id)
-
-            elif action.startswith("publish_now_"):
-                draft_id = int(action.split("_")[2])
-                self._publish_now(call.message, draft_id)
-
-            elif action.startswith("schedule_1h_"):
-                draft_id = int(action.split("_")[2])
-                self._schedule_post(call.message, draft_id, hours=1)
-
-            elif action.startswith("schedule_3h_"):
-                draft_id = int(action.split("_")[2])
-                self._schedule_post(call.message, draft_id, hours=3)
+            # Queue the action before awaiting anything, so callbacks from
+            # one chat enter its queue in arrival order: in order within a
+            # chat, concurrently across chats
+            self._enqueue_callback(call)
+
+            # Then clear the button's loading state. Not throttled: it sends
+            # no message, and Telegram expects it within seconds. A failed
+            # answer (e.g. "query is too old") must not drop the action.
+            try:
+                await self.bot.answer_callback_query(call.id)
+            except Exception as e:
+                log.warning("⚠️  Could not answer callback %s: %s", call.id, e)
+
+    def _enqueue_callback(self, call):
+        """Queue a callback on its chat's queue, starting the chat's worker if needed."""
+        chat_id = call.message.chat.id
+
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = self._chat_queues[chat_id] = asyncio.Queue()
+
+        queue.put_nowait(call)
+
+        if chat_id not in self._chat_workers:
+            self._chat_workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id))
+
+    async def _chat_worker(self, chat_id: int):
+        """Drain one chat's callback queue in FIFO order, then exit."""
+        queue = self._chat_queues[chat_id]
+
+        try:
+            while not queue.empty():
+                call = queue.get_nowait()
+                try:
+                    await self._dispatch_callback(call)
+                except Exception as e:
+                    log.error("✗ Error handling callback %r: %s", call.data, e, exc_info=True)
+                finally:
+                    queue.task_done()
+        finally:
+            # Nothing is awaited between the empty() check and here, so no
+            # callback can slip into the queue after the worker has finished
+            del self._chat_workers[chat_id]
+            del self._chat_queues[chat_id]
+
+    async def _dispatch_callback(self, call):
+        """Run the handler for one callback's data."""
+        data = call.data
+
+        if data.startswith("schedule:"):
+            # "schedule:<hours>:<draft_id>", e.g. "schedule:3:12"
+            hours, _, draft_id = data[len("schedule:"):].partition(":")
+            if hours.isdigit() and draft_id.isdigit():
+                await self._schedule_post(call.message, int(draft_id), hours=int(hours))
+                return
+        else:
+            # "<action>_<draft_id>", e.g. "regenerate_text_12"
+            action, _, draft_id = data.rpartition("_")
+            handler = self._callback_actions.get(action)
+            if handler and draft_id.isdigit():
+                await handler(call.message, int(draft_id))
+                return
 
-            elif action.startswith("schedule_tomorrow_"):
-                draft_id = int(action.split("_")[2])
-                self._schedule_post(call.message, draft_id, hours=24)
+        # Ignore unknown actions and malformed data instead of raising
+        log.debug("Ignoring callback data %r", data)
 
-            elif action.startswith("back_to_edit_"):
-                draft_id = int(action.split("_")[3])
-                self._back_to_edit(call.message, draft_id)
+    async def _do_generate(self, chat_id: int, processing_msg_id: int, honey_type: str):
+        """Generate image and text for a new post and send it for review."""
+        try:
+            # Generate image and text concurrently
+            (image_path, image_bytes), post_text = await asyncio.gather(
+                self._run_blocking(self.image_gen.generate_honey_marketing_image, honey_type),
+                self.text_gen.generate_facebook_post(
+                    honey_type=honey_type,
+                    tone="friendly",
+                    include_emoji=True
+                )
+            )
 
-            elif action.startswith("regenerate_text_"):
-                draft_id = int(action.split("_")[2])
-                self._regenerate_text(call.message, draft_id)
+            if not image_path:
+                await self._api(
+                    self.bot.edit_message_text,
+                    "❌ სურათის გენერაცია ვერ მოხერხდა. გთხოვ, სცადე თავიდან.",
+                    chat_id,
+                    processing_msg_id
+                )
+                return
 
-            elif action.startswith("regenerate_image_"):
-                draft_id = int(action.split("_")[2])
-                self._regenerate_image(call.message, draft_id)
+            if not post_text:
+                await self._api(
+                    self.bot.edit_message_text,
+                    "❌ ტექსტის გენერაცია ვერ მოხერხდა. გთხოვ, სცადე თავიდან.",
+                    chat_id,
+                    processing_msg_id
+                )
+                return
 
-            elif action.startswith("edit_"):
-                draft_id = int(action.split("_")[1])
-                self._open_dashboard(call.message, draft_id)
+            # Delete processing message
+            await self._api(self.bot.delete_message, chat_id, processing_msg_id)
 
-            elif action.startswith("reject_"):
-                draft_id = int(action.split("_")[1])
-                self._reject_draft(call.message, draft_id)
+            # Send the complete post
+            await self._send_post_for_review(chat_id, honey_type, post_text, image_path, image_bytes)
 
-            # Answer callback to remove loading state
-            self.bot.answer_callback_query(call.id)
+        except Exception as e:
+            log.error("✗ Error creating post for %s: %s", honey_type, e, exc_info=True)
+            await self._api(
+                self.bot.edit_message_text,
+                f"❌ შეცდომა: {str(e)}",
+                chat_id,
+                processing_msg_id
+            )
 
-    def _send_post_for_review(
+    async def _send_post_for_review(
         self,
         chat_id: int,
         honey_type: str,
         post_text: str,
-        image_path: str
+        image_path: str,
+        image_bytes: Optional[bytes] = None
     ):
-        """Send generated post with inline buttons for review."""
+        """
+        Send generated post with inline buttons for review.
+
+        image_bytes, when the generator still has them in memory, are sent
+        instead of reading image_path back from disk.
+        """
 
         # Save to database
-        draft_id = self.db.create_draft(
+        draft_id = await self._run_db(
+            self.db.create_draft,
             honey_type=honey_type,
             post_text=post_text,
             image_path=image_path
         )
 
-        self.current_draft_id = draft_id
-
         # Create inline keyboard
-        markup = types.InlineKeyboardMarkup(row_width=2)
+        markup = self._create_review_markup(draft_id)
 
-        markup.add(
-            types.InlineKeyboardButton("✅ დადასტურება", callback_data=f"approve_{draft_id}"),
-            types.InlineKeyboardButton("❌ უარყოფა", callback_data=f"reject_{draft_id}")
+        # Send photo with caption and buttons
+        caption = f"🍯 {honey_type}\n\n{post_text}\n\n📋 Draft ID: #{draft_id}"
+        sent_message = await self._send_photo(chat_id, image_path, caption, markup, image_bytes)
+
+        # Update draft with telegram message ID and the photo's file_id (so
+        # later sends of this image need no upload). The draft ID is part of
+        # the caption and callback data, so the row has to exist before sending.
+        await self._run_db(
+            self.db.update_draft_message_id,
+            draft_id,
+            sent_message.message_id,
+            _photo_file_id(sent_message)
         )
 
-        markup.add(
-            types.InlineKeyboardButton("🔄 ტექსტის შეცვლა", callback_data=f"regenerate_text_{draft_id}"),
-            types.InlineKeyboardButton("🎨 ფოტოს შეცვლა", callback_data=f"regenerate_image_{draft_id}")
-        )
+    async def _send_photo(
+        self,
+        chat_id: int,
+        image_path: str,
+        caption: str,
+        markup: Optional[str],
+        image_bytes: Optional[bytes] = None,
+        file_id: Optional[str] = None
+    ):
+        """
+        Send a photo, reusing Telegram's file_id if this exact file was uploaded before.
 
-        markup.add(
-            types.InlineKeyboardButton("✏️ დაშბორდზე რედაქტირება", callback_data=f"edit_{draft_id}")
-        )
+        file_id, when the draft has one stored (drafts.telegram_file_id), is
+        used first: it survives restarts and needs no upload.
+        """
+        if file_id:
+            return await self._api(self.bot.send_photo, chat_id, file_id, caption=caption, reply_markup=markup)
 
-        # Send photo with caption and buttons
-        with open(image_path, 'rb') as photo:
-            caption = f"🍯 {honey_type}\n\n{post_text}\n\n📋 Draft ID: #{draft_id}"
+        # Image files are overwritten in place on regeneration, so key on
+        # size and mtime as well as the path
+        stat = os.stat(image_path)
+        key = (image_path, stat.st_size, stat.st_mtime_ns)
 
-            sent_message = self.bot.send_photo(
-                chat_id,
-                photo,
+        file_id = self._photo_file_ids.get(key)
+        if file_id:
+            return await self._api(self.bot.send_photo, chat_id, file_id, caption=caption, reply_markup=markup)
+
+        if image_bytes is not None:
+            sent_message = await self._api(self.bot.send_photo, chat_id, image_bytes, caption=caption, reply_markup=markup)
+        else:
+            # aiohttp streams the open file in chunks; it is not read into memory
+            with open(image_path, 'rb') as photo:
+                sent_message = await self._api(self.bot.send_photo, chat_id, photo, caption=caption, reply_markup=markup)
+
+        file_id = _photo_file_id(sent_message)
+        if file_id:
+            self._photo_file_ids[key] = file_id
+            if len(self._photo_file_ids) > DRAFT_CACHE_SIZE:
+                self._photo_file_ids.pop(next(iter(self._photo_file_ids)), None)
+
+        return sent_message
+
+    async def _api(self, method: Callable, *args, **kwargs):
+        """Call a Bot API method under the send rate limit."""
+        async with self._send_throttle:
+            return await method(*args, **kwargs)
+
+    def _schedule_edit(self, chat_id: int, message_id: int, caption: str, markup: Optional[str]):
+        """
+        Edit a message's caption after EDIT_DEBOUNCE, replacing any edit of
+        the same message still waiting to be sent.
+
+        Every caption edit goes through here, so edits of one message are
+        applied in the order they were scheduled.
+        """
+        key = (chat_id, message_id)
+
+        pending = self._pending_edits.get(key)
+        if pending is not None:
+            pending.cancel()
+
+        self._pending_edits[key] = self._spawn(self._edit_after(EDIT_DEBOUNCE, key, caption, markup))
+
+    async def _edit_after(self, delay: float, key: tuple, caption: str, markup: Optional[str]):
+        """Send a debounced caption edit unless a newer one replaces it first."""
+        await asyncio.sleep(delay)
+
+        # Past this point the edit is no longer cancellable by newer ones
+        del self._pending_edits[key]
+
+        # Let an earlier edit of the same message finish first, so it cannot
+        # land after (and overwrite) this one
+        previous = self._sending_edits.get(key)
+        current = self._sending_edits[key] = asyncio.current_task()
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        chat_id, message_id = key
+        try:
+            await self._api(
+                self.bot.edit_message_caption,
                 caption=caption,
+                chat_id=chat_id,
+                message_id=message_id,
                 reply_markup=markup
             )
+        except Exception as e:
+            log.error("✗ Error editing message %d: %s", message_id, e, exc_info=True)
+        finally:
+            if self._sending_edits.get(key) is current:
+                del self._sending_edits[key]
+
+    async def _drop_edits(self, chat_id: int, message_id: int):
+        """Cancel a message's waiting caption edit and wait for one being sent (before deleting it)."""
+        key = (chat_id, message_id)
+
+        pending = self._pending_edits.pop(key, None)
+        if pending is not None:
+            pending.cancel()
+
+        sending = self._sending_edits.get(key)
+        if sending is not None:
+            await asyncio.wait([sending])
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task and keep it referenced until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _run_blocking(self, func: Callable, *args, **kwargs):
+        """Run a blocking call (Imagen SDK) on the bounded generation pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._gen_pool, partial(func, *args, **kwargs))
+
+    async def _run_db(self, func: Callable, *args, **kwargs):
+        """
+        Run a Database/PostScheduler call in a worker thread.
 
-            # Update draft with telegram message ID
-            self.db.connection.execute(
-                "UPDATE drafts SET telegram_message_id = ? WHERE id = ?",
-                (sent_message.message_id, draft_id)
-            )
-            self.db.connection.commit()
+        Kept off the generation pool so database calls never queue behind
+        image generation. Database is thread-safe (locked writer, pooled
+        readers), and in WAL mode readers do not wait for the writer.
+        """
+        return await asyncio.to_thread(func, *args, **kwargs)
 
-    def _approve_draft(self, message, draft_id: int):
-        """Approve a draft and show publish options."""
-        self.db.update_draft_status(draft_id, "approved")
+    async def _get_draft_cached(self, draft_id: int, fresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get a draft, reusing the row from a recent callback when possible.
 
-        # Create publish options keyboard
-        markup = types.InlineKeyboardMarkup(row_width=1)
+        Args:
+            draft_id: Draft ID
+            fresh: Always re-read the row (and refresh the cache); for
+                   handlers that use post_text or status, which the
+                   dashboard can change at any time
 
-        markup.add(
-            types.InlineKeyboardButton("🚀 დაუყოვნებლივ გამოქვეყნება", callback_data=f"publish_now_{draft_id}"),
-            types.InlineKeyboardButton("📅 დაგეგმვა (1 საათში)", callback_data=f"schedule_1h_{draft_id}"),
-            types.InlineKeyboardButton("📅 დაგეგმვა (3 საათში)", callback_data=f"schedule_3h_{draft_id}"),
-            types.InlineKeyboardButton("📅 დაგეგმვა (ხვალ)", callback_data=f"schedule_tomorrow_{draft_id}"),
-            types.InlineKeyboardButton("◀️ უკან", callback_data=f"back_to_edit_{draft_id}")
-        )
+        Returns:
+            Draft dict or None if not found
+        """
+        cached = None if fresh else self._draft_cache.get(draft_id)
+        if cached is not None:
+            expires_at, draft = cached
+            if time.monotonic() < expires_at:
+                self._draft_cache.move_to_end(draft_id)
+                return draft
+
+        draft = await self._run_db(self.db.get_draft, draft_id)
+
+        if draft:
+            self._draft_cache[draft_id] = (time.monotonic() + DRAFT_CACHE_TTL, draft)
+            self._draft_cache.move_to_end(draft_id)
+            if len(self._draft_cache) > DRAFT_CACHE_SIZE:
+                self._draft_cache.popitem(last=False)
+
+        return draft
+
+    def _invalidate_draft(self, draft_id: int):
+        """Drop a draft from the lookup cache after it was modified."""
+        self._draft_cache.pop(draft_id, None)
+
+    async def _approve_draft(self, message, draft_id: int):
+        """Approve a draft and show publish options."""
+        await self._run_db(self.db.update_draft_status, draft_id, "approved")
+        self._invalidate_draft(draft_id)
+
+        # Publish options keyboard
+        markup = _publish_markup(draft_id)
 
-        self.bot.edit_message_caption(
-            caption=message.caption + "\n\n✅ დამტკიცებულია! აირჩიე გამოქვეყნების ვარიანტი:",
-            chat_id=message.chat.id,
-            message_id=message.message_id,
-            reply_markup=markup
+        self._schedule_edit(
+            message.chat.id,
+            message.message_id,
+            message.caption + "\n\n✅ დამტკიცებულია! აირჩიე გამოქვეყნების ვარიანტი:",
+            markup
         )
 
-    def _reject_draft(self, message, draft_id: int):
+    async def _reject_draft(self, message, draft_id: int):
         """Reject a draft."""
-        self.db.update_draft_status(draft_id, "rejected")
+        await self._run_db(self.db.update_draft_status, draft_id, "rejected")
+        self._invalidate_draft(draft_id)
 
-        self.bot.edit_message_caption(
-            caption=message.caption + "\n\n❌ უარყოფილია",
-            chat_id=message.chat.id,
-            message_id=message.message_id,
-            reply_markup=None
+        self._schedule_edit(
+            message.chat.id,
+            message.message_id,
+            message.caption + "\n\n❌ უარყოფილია",
+            None
         )
 
-    def _regenerate_text(self, message, draft_id: int):
+    async def _regenerate_text(self, message, draft_id: int):
         """Regenerate only the text for a draft."""
-        draft = self.db.get_draft(draft_id)
+        draft = await self._get_draft_cached(draft_id)  # Only needs honey_type
 
         if not draft:
-            self.bot.send_message(message.chat.id, "❌ დრაფტი არ მოიძებნა.")
+            await self._api(self.bot.send_message, message.chat.id, "❌ დრაფტი არ მოიძებნა.")
             return
 
         # Generate new text
-        new_text = self.text_gen.generate_facebook_post(
+        new_text = await self.text_gen.generate_facebook_post(
             honey_type=draft['honey_type'],
             tone="friendly",
-            include_emoji=True
+            include_emoji=True,
+            use_cache=False  # The user asked for a different text
         )
 
         if new_text:
-            self.db.update_draft_text(draft_id, new_text, edited_by="gemini")
+            await self._run_db(self.db.update_draft_text, draft_id, new_text, edited_by="gemini")
+            self._invalidate_draft(draft_id)
 
             # Update message
             new_caption = f"🍯 {draft['honey_type']}\n\n{new_text}\n\n📋 Draft ID: #{draft_id}\n🔄 ტექსტი განახლებულია!"
@@ -320,47 +682,49 @@ class MarketingBot:
             # Recreate buttons
             markup = self._create_review_markup(draft_id)
 
-            self.bot.edit_message_caption(
-                caption=new_caption,
-                chat_id=message.chat.id,
-                message_id=message.message_id,
-                reply_markup=markup
-            )
+            self._schedule_edit(message.chat.id, message.message_id, new_caption, markup)
         else:
-            self.bot.send_message(message.chat.id, "❌ ტექსტის გენერაცია ვერ მოხერხდა.")
+            await self._api(self.bot.send_message, message.chat.id, "❌ ტექსტის გენერაცია ვერ მოხერხდა.")
 
-    def _regenerate_image(self, message, draft_id: int):
+    async def _regenerate_image(self, message, draft_id: int):
         """Regenerate only the image for a draft."""
-        draft = self.db.get_draft(draft_id)
+        draft = await self._get_draft_cached(draft_id, fresh=True)  # Uses post_text
 
         if not draft:
-            self.bot.send_message(message.chat.id, "❌ დრაფტი არ მოიძებნა.")
+            await self._api(self.bot.send_message, message.chat.id, "❌ დრაფტი არ მოიძებნა.")
             return
 
         # Generate new image
-        new_image_path = self.image_gen.generate_honey_marketing_image(draft['honey_type'])
+        new_image_path, image_bytes = await self._run_blocking(
+            self.image_gen.generate_honey_marketing_image,
+            draft['honey_type']
+        )
 
         if new_image_path:
-            self.db.update_draft_image(draft_id, new_image_path)
+            await self._run_db(self.db.update_draft_image, draft_id, new_image_path)
+            self._invalidate_draft(draft_id)
 
             # Send new photo (can't edit photo in Telegram, must send new)
-            self._send_post_for_review(
+            await self._send_post_for_review(
                 message.chat.id,
                 draft['honey_type'],
                 draft['post_text'],
-                new_image_path
+                new_image_path,
+                image_bytes
             )
 
-            # Delete old message
-            self.bot.delete_message(message.chat.id, message.message_id)
+            # Delete old message (and any caption edit still headed for it)
+            await self._drop_edits(message.chat.id, message.message_id)
+            await self._api(self.bot.delete_message, message.chat.id, message.message_id)
         else:
-            self.bot.send_message(message.chat.id, "❌ სურათის გენერაცია ვერ მოხერხდა.")
+            await self._api(self.bot.send_message, message.chat.id, "❌ სურათის გენერაცია ვერ მოხერხდა.")
 
-    def _open_dashboard(self, message, draft_id: int):
+    async def _open_dashboard(self, message, draft_id: int):
         """Provide link to dashboard for editing."""
-        dashboard_url = os.getenv("DASHBOARD_URL", "http://localhost:8501")
+        dashboard_url = self.dashboard_url
 
-        self.bot.send_message(
+        await self._api(
+            self.bot.send_message,
             message.chat.id,
             f"✏️ დაშბორდზე რედაქტირებისთვის:\n{dashboard_url}/?draft_id={draft_id}",
             reply_markup=types.InlineKeyboardMarkup().add(
@@ -368,103 +732,259 @@ class MarketingBot:
             )
         )
 
-    def _publish_now(self, message, draft_id: int):
+    async def _publish_now(self, message, draft_id: int):
         """Publish post immediately."""
-        result = self.scheduler.publish_now(draft_id)
+        result = await self._run_db(self.scheduler.publish_now, draft_id)
+        self._invalidate_draft(draft_id)
 
         if result['success']:
-            self.bot.edit_message_caption(
-                caption=message.caption + f"\n\n🎉 გამოქვეყნებულია!\n📅 {result['published_at'][:19]}",
-                chat_id=message.chat.id,
-                message_id=message.message_id,
-                reply_markup=None
+            self._schedule_edit(
+                message.chat.id,
+                message.message_id,
+                message.caption + f"\n\n🎉 გამოქვეყნებულია!\n📅 {result['published_at'][:19]}",
+                None
             )
 
-            self.bot.send_message(
-                message.chat.id,
+            text = (
                 f"✅ პოსტი #{draft_id} წარმატებით გამოქვეყნდა!\n\n"
                 f"ახლა შეგიძლია გამოიყენო Facebook/Instagram-ზე:\n"
                 f"📝 ტექსტი: დაკოპირებული\n"
                 f"🖼 სურათი: {result['image_path']}"
             )
+
+            file_id = result['telegram_file_id']
+            if file_id or (result['image_path'] and os.path.exists(result['image_path'])):
+                # Hand over the image itself, by its stored file_id when the
+                # review photo was uploaded before (no re-upload)
+                await self._send_photo(message.chat.id, result['image_path'], text, None, file_id=file_id)
+            else:
+                await self._api(self.bot.send_message, message.chat.id, text)
         else:
-            self.bot.send_message(
+            await self._api(
+                self.bot.send_message,
                 message.chat.id,
                 f"❌ გამოქვეყნება ვერ მოხერხდა: {result.get('error', 'უცნობი შეცდომა')}"
             )
 
-    def _schedule_post(self, message, draft_id: int, hours: int):
+    async def _schedule_post(self, message, draft_id: int, hours: int):
         """Schedule a post for future publication."""
-        from datetime import datetime, timedelta
-
         scheduled_time = datetime.now() + timedelta(hours=hours)
-        success = self.scheduler.schedule_post(draft_id, scheduled_time)
+        success = await self._run_db(self.scheduler.schedule_post, draft_id, scheduled_time)
 
         if success:
             time_str = scheduled_time.strftime("%Y-%m-%d %H:%M")
 
-            self.bot.edit_message_caption(
-                caption=message.caption + f"\n\n📅 დაგეგმილია: {time_str}",
-                chat_id=message.chat.id,
-                message_id=message.message_id,
-                reply_markup=None
+            self._schedule_edit(
+                message.chat.id,
+                message.message_id,
+                message.caption + f"\n\n📅 დაგეგმილია: {time_str}",
+                None
             )
 
-            self.bot.send_message(
+            await self._api(
+                self.bot.send_message,
                 message.chat.id,
                 f"✅ პოსტი #{draft_id} დაგეგმილია:\n📅 {time_str}\n\n"
                 f"პოსტი ავტომატურად გამოქვეყნდება მითითებულ დროს."
             )
         else:
-            self.bot.send_message(
+            await self._api(
+                self.bot.send_message,
                 message.chat.id,
                 "❌ დაგეგმვა ვერ მოხერხდა. დარწმუნდი რომ პოსტი დამტკიცებულია."
             )
 
-    def _back_to_edit(self, message, draft_id: int):
+    async def _back_to_edit(self, message, draft_id: int):
         """Go back to edit mode."""
-        draft = self.db.get_draft(draft_id)
+        draft = await self._get_draft_cached(draft_id, fresh=True)  # Uses post_text
 
         if draft:
             # Restore original review markup
             markup = self._create_review_markup(draft_id)
 
-            self.bot.edit_message_caption(
-                caption=f"🍯 {draft['honey_type']}\n\n{draft['post_text']}\n\n📋 Draft ID: #{draft_id}",
-                chat_id=message.chat.id,
-                message_id=message.message_id,
-                reply_markup=markup
+            self._schedule_edit(
+                message.chat.id,
+                message.message_id,
+                f"🍯 {draft['honey_type']}\n\n{draft['post_text']}\n\n📋 Draft ID: #{draft_id}",
+                markup
             )
 
-    def _create_review_markup(self, draft_id: int) -> types.InlineKeyboardMarkup:
-        """Create inline keyboard for review."""
-        markup = types.InlineKeyboardMarkup(row_width=2)
-
-        markup.add(
-            types.InlineKeyboardButton("✅ დადასტურება", callback_data=f"approve_{draft_id}"),
-            types.InlineKeyboardButton("❌ უარყოფა", callback_data=f"reject_{draft_id}")
-        )
-
-        markup.add(
-            types.InlineKeyboardButton("🔄 ტექსტის შეცვლა", callback_data=f"regenerate_text_{draft_id}"),
-            types.InlineKeyboardButton("🎨 ფოტოს შეცვლა", callback_data=f"regenerate_image_{draft_id}")
-        )
+    def _create_review_markup(self, draft_id: int) -> str:
+        """Create inline keyboard for review (as ready-to-send JSON)."""
+        return _review_markup(draft_id)
+
+    async def start_polling(self):
+        """Start the bot in polling mode (run with asyncio.run)."""
+        log.info("🤖 Telegram Bot started polling...")
+        try:
+            # getUpdates is refused while a webhook is set (see start_webhook)
+            await self.bot.remove_webhook()
+            await self.bot.infinity_polling(skip_pending=True)
+        finally:
+            # telebot closes its own HTTP session when polling ends or is cancelled
+            await self.text_gen.close()
+            self.stop()
+
+    async def start_webhook(
+        self,
+        webhook_url: str,
+        port: int = WEBHOOK_PORT,
+        dashboard_port: Optional[int] = None
+    ):
+        """
+        Receive updates through a webhook instead of polling (run with asyncio.run).
 
-        markup.add(
-            types.InlineKeyboardButton("✏️ დაშბორდზე რედაქტირება", callback_data=f"edit_{draft_id}")
-        )
+        Telegram POSTs each update to webhook_url + WEBHOOK_PATH. Every
+        update is handled in its own task and acknowledged immediately, so
+        a slow handler never holds back the next update.
 
-        return markup
+        Args:
+            webhook_url: Public HTTPS base URL that reaches this server
+            port: Local port to listen on
+            dashboard_port: Local dashboard port; every other request
+                (HTTP and WebSocket) is forwarded there, so the bot and the
+                dashboard share the one port the platform routes
+        """
+        app = web.Application()
+        app.router.add_post(WEBHOOK_PATH, self._handle_webhook)
+
+        session = None
+        if dashboard_port:
+            # auto_decompress=False passes encoded bodies through untouched
+            session = aiohttp.ClientSession(auto_decompress=False)
+            origin = f"http://127.0.0.1:{dashboard_port}"
+            app.router.add_route("*", "/{tail:.*}", partial(self._proxy_dashboard, session, origin))
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, port=port).start()
+            await self.bot.set_webhook(
+                url=webhook_url.rstrip("/") + WEBHOOK_PATH,
+                secret_token=self._webhook_secret,
+                drop_pending_updates=True
+            )
 
-    def start_polling(self):
-        """Start the bot in polling mode."""
-        print("🤖 Telegram Bot started polling...")
-        self.bot.infinity_polling()
+            log.info("🤖 Telegram Bot receiving updates via webhook on port %d...", port)
+            await asyncio.Event().wait()  # Serve until cancelled
+        finally:
+            await runner.cleanup()
+            if session:
+                await session.close()
+            await self.bot.close_session()
+            await self.text_gen.close()
+            self.stop()
+
+    async def _handle_webhook(self, request: web.Request) -> web.Response:
+        """Accept one update from Telegram and process it in the background."""
+        secret = request.headers.get(WEBHOOK_SECRET_HEADER, "")
+        if not hmac.compare_digest(secret, self._webhook_secret):
+            return web.Response(status=403)
+
+        try:
+            update = types.Update.de_json(await request.json())
+        except (ValueError, KeyError, TypeError):
+            update = None
+
+        # Malformed body (de_json maps null to None): a 5xx would make
+        # Telegram retry it forever
+        if update is None:
+            log.warning("⚠️ Rejected malformed webhook update")
+            return web.Response(status=400)
+
+        self._spawn(self.bot.process_new_updates([update]))
+
+        return web.Response()
+
+    async def _proxy_dashboard(
+        self,
+        session: aiohttp.ClientSession,
+        origin: str,
+        request: web.Request
+    ) -> web.StreamResponse:
+        """Forward a non-webhook request to the dashboard and stream back its reply."""
+        url = origin + str(request.rel_url)
+        # Host is kept so the dashboard's same-origin checks see the public host
+        headers = [
+            (name, value) for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+
+        try:
+            if request.headers.get("Upgrade", "").lower() == "websocket":
+                return await self._proxy_dashboard_ws(session, url, headers, request)
+
+            async with session.request(
+                request.method, url,
+                headers=headers,
+                data=request.content if request.body_exists else None,
+                allow_redirects=False
+            ) as upstream:
+                response = web.StreamResponse(
+                    status=upstream.status,
+                    headers=[
+                        (name, value) for name, value in upstream.headers.items()
+                        if name.lower() not in HOP_BY_HOP_HEADERS
+                    ]
+                )
+                await response.prepare(request)
+                async for chunk in upstream.content.iter_chunked(PROXY_CHUNK_SIZE):
+                    await response.write(chunk)
+                await response.write_eof()
+                return response
+        except aiohttp.ClientError as e:
+            log.warning("⚠️ Dashboard unreachable: %s", e)
+            return web.Response(status=502)
+
+    async def _proxy_dashboard_ws(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: list,
+        request: web.Request
+    ) -> web.WebSocketResponse:
+        """Relay a dashboard WebSocket in both directions until either side closes."""
+        protocols = [
+            protocol.strip()
+            for protocol in request.headers.get("Sec-WebSocket-Protocol", "").split(",")
+            if protocol.strip()
+        ]
+        # aiohttp sets its own handshake headers for the upstream connection
+        headers = [(name, value) for name, value in headers if not name.lower().startswith("sec-websocket-")]
+
+        async with session.ws_connect(url, headers=headers, protocols=protocols) as upstream:
+            downstream = web.WebSocketResponse(protocols=(upstream.protocol,) if upstream.protocol else ())
+            await downstream.prepare(request)
+
+            relays = [
+                asyncio.create_task(self._relay_ws(upstream, downstream)),
+                asyncio.create_task(self._relay_ws(downstream, upstream)),
+            ]
+            try:
+                await asyncio.wait(relays, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for relay in relays:
+                    relay.cancel()
+                await asyncio.gather(*relays, return_exceptions=True)
+                await downstream.close()
+
+        return downstream
+
+    @staticmethod
+    async def _relay_ws(source, sink):
+        """Copy WebSocket messages from source to sink until source closes."""
+        async for msg in source:
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                await sink.send_str(msg.data)
+            elif msg.type == aiohttp.WSMsgType.BINARY:
+                await sink.send_bytes(msg.data)
+            else:
+                break
 
     def stop(self):
-        """Stop the bot."""
-        self.bot.stop_polling()
-        print("🤖 Telegram Bot stopped")
+        """Release the bot's worker threads."""
+        self._gen_pool.shutdown(wait=False)
+        log.info("🤖 Telegram Bot stopped")
 
 
 # Example usage
@@ -6,12 +6,92 @@ Generates engaging Facebook posts in Georgian language for organic honey marketi
 """
 
 import os
-import google.generativeai as genai
-from typing import Optional
+import json
+import time
+import asyncio
+import logging
+import aiohttp
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+# Gemini REST endpoint (streamGenerateContent), read as server-sent events
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+GEMINI_STREAM_PARAMS = {"alt": "sse"}
+
+# Per-request timeout for Gemini calls (seconds)
+GEMINI_TIMEOUT = 60
+
+# Number of generated posts kept per (honey_type, tone, include_emoji, max_length)
+POST_CACHE_SIZE = 512
+
+# Seconds a generated post is reused; short, so repeated /create calls
+# still get fresh wording after a while
+POST_CACHE_TTL = 900
+
+# Prompt templates (filled with str.format_map; substituted values are not
+# re-parsed, so braces in user text are safe)
+_POST_PROMPT_TEMPLATE = """
+შექმენი მიმზიდველი Facebook პოსტი ორგანული {honey_type}-ის შესახებ.
+
+მოთხოვნები:
+- **ენა: მხოლოდ ქართული**
+- ტონი: {tone}
+- სიგრძე: მაქსიმუმ {max_length} სიმბოლო
+- მოიცავს:
+  • ძმრის სარგებელს ჯანმრთელობისთვის
+  • მის ბუნებრივ წარმოშობას
+  • იმის მიზეზს, თუ რატომ არის ეს ძმარი განსაკუთრებული
+  • მოწოდებას მოქმედებისკენ (Call-to-Action)
+{emoji_clause}
+
+არ გამოიყენო ჰეშთეგები. არ დაწერო "სათაური:" ან "პოსტი:" - დაიწყე პირდაპირ ტექსტით.
+დაწერე ისე, რომ ადამიანებს სურდეთ პროდუქტის შეძენა.
+"""
+
+_EMOJI_ON = "- გამოიყენე შესაბამისი ემოჯები"
+_EMOJI_OFF = "- ემოჯების გარეშე"
+
+_HONEY_INFO_PROMPT_TEMPLATE = """
+მომეცი მოკლე, ინფორმაციული აღწერა {honey_type}-ის შესახებ ქართულ ენაზე.
+
+მოიცავს:
+1. რა მცენარიდან მოდის ეს ძმარი
+2. მისი უნიკალური თვისებები
+3. რა სარგებელი მოაქვს ჯანმრთელობისთვის
+4. გემო და არომატი
+
+პასუხი უნდა იყოს 3-4 წინადადება, მარტივი და გასაგები ენით.
+"""
+
+_IMPROVE_PROMPT_TEMPLATE = """
+შეცვალე შემდეგი ტექსტი ამ ინსტრუქციის მიხედვით: "{instruction}"
+
+ორიგინალი ტექსტი:
+{original_text}
+
+გაითვალისწინე:
+- შეინარჩუნე ქართული ენა
+- შეინარჩუნე ძირითადი მესიჯი
+- გააუმჯობესე მოთხოვნილი ასპექტი
+"""
+
+
+def _chunk_text(chunk: dict) -> str:
+    """Text carried by one streamed response chunk ("" if it has none)."""
+    try:
+        parts = chunk["candidates"][0]["content"]["parts"]
+    except (KeyError, IndexError):
+        # Blocked or empty responses come back without candidates/parts
+        return ""
+
+    return "".join(part.get("text", "") for part in parts)
 
 
 class TextGenerator:
-    """Generates marketing text using Google Gemini API."""
+    """Generates marketing text using Google Gemini API (REST over aiohttp)."""
 
     def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash"):
         """
@@ -24,21 +104,74 @@ class TextGenerator:
         """
         self.api_key = api_key
         self.model_name = model_name
+        self.url = GEMINI_API_URL.format(model=model_name)
+
+        # Shared HTTP session (keep-alive connection pool), created on first
+        # use so it belongs to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
 
-        # Configure Gemini
-        genai.configure(api_key=api_key)
+        # LRU of (expiry, generated post) keyed by the generation
+        # parameters; the prompt is a pure function of the key, so a hit
+        # skips Gemini
+        self._post_cache: "OrderedDict[Tuple[str, str, bool, int], Tuple[float, str]]" = OrderedDict()
 
-        # Initialize the model
-        self.model = genai.GenerativeModel(model_name)
+        log.info("✓ Text Generator initialized (Model: %s)", model_name)
 
-        print(f"✓ Text Generator initialized (Model: {model_name})")
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=GEMINI_TIMEOUT)
+            )
+        return self._session
 
-    def generate_facebook_post(
+    async def _generate(self, prompt: str) -> Optional[str]:
+        """
+        Send a prompt to Gemini and collect the streamed response.
+
+        The reply arrives as a series of small chunks that are parsed as
+        they come in, instead of one JSON document buffered whole at the end.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            Generated text (stripped), or None if the response has no text
+        """
+        session = await self._get_session()
+        chunks = []
+
+        # API key goes in a header rather than the query string, so it never
+        # shows up in logged URLs
+        async with session.post(
+            self.url,
+            params=GEMINI_STREAM_PARAMS,
+            headers={"x-goog-api-key": self.api_key},
+            json={"contents": [{"parts": [{"text": prompt}]}]}
+        ) as response:
+            response.raise_for_status()
+
+            # One "data: {...}" line per chunk, events separated by blank lines
+            async for line in response.content:
+                if line.startswith(b"data:"):
+                    chunks.append(_chunk_text(json.loads(line[5:])))
+
+        return "".join(chunks).strip() or None
+
+    async def close(self):
+        """Close the HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def generate_facebook_post(
         self,
         honey_type: str,
         tone: str = "friendly",
         include_emoji: bool = True,
-        max_length: int = 300
+        max_length: int = 300,
+        use_cache: bool = True
     ) -> Optional[str]:
         """
         Generate a Facebook post in Georgian about organic honey.
@@ -48,48 +181,54 @@ class TextGenerator:
             tone: Tone of the post ('friendly', 'professional', 'enthusiastic')
             include_emoji: Whether to include emojis
             max_length: Maximum character length of the post
+            use_cache: Return a post generated for the same parameters in
+                       the last POST_CACHE_TTL seconds if there is one; pass False to always ask
+                       Gemini for a new post (it then replaces the cached one)
 
         Returns:
             Generated text in Georgian, or None if generation failed
         """
-        try:
-            # Create a detailed prompt in Georgian for better results
-            prompt = f"""
-შექმენი მიმზიდველი Facebook პოსტი ორგანული {honey_type}-ის შესახებ.
+        key = (honey_type, tone, include_emoji, max_length)
 
-მოთხოვნები:
-- **ენა: მხოლოდ ქართული**
-- ტონი: {tone}
-- სიგრძე: მაქსიმუმ {max_length} სიმბოლო
-- მოიცავს:
-  • ძმრის სარგებელს ჯანმრთელობისთვის
-  • მის ბუნებრივ წარმოშობას
-  • იმის მიზეზს, თუ რატომ არის ეს ძმარი განსაკუთრებული
-  • მოწოდებას მოქმედებისკენ (Call-to-Action)
-{"- გამოიყენე შესაბამისი ემოჯები" if include_emoji else "- ემოჯების გარეშე"}
+        if use_cache:
+            cached = self._post_cache.get(key)
+            if cached is not None:
+                expires_at, text = cached
+                if time.monotonic() < expires_at:
+                    self._post_cache.move_to_end(key)
+                    return text
+                del self._post_cache[key]
 
-არ გამოიყენო ჰეშთეგები. არ დაწერო "სათაური:" ან "პოსტი:" - დაიწყე პირდაპირ ტექსტით.
-დაწერე ისე, რომ ადამიანებს სურდეთ პროდუქტის შეძენა.
-"""
+        try:
+            # Detailed prompt in Georgian for better results
+            prompt = _POST_PROMPT_TEMPLATE.format_map({
+                "honey_type": honey_type,
+                "tone": tone,
+                "max_length": max_length,
+                "emoji_clause": _EMOJI_ON if include_emoji else _EMOJI_OFF,
+            })
 
-            print(f"📝 Generating Georgian text for: {honey_type}...")
+            log.debug("📝 Generating Georgian text for: %s...", honey_type)
 
             # Generate content
-            response = self.model.generate_content(prompt)
-
-            if response.text:
-                generated_text = response.text.strip()
-                print(f"✓ Generated {len(generated_text)} characters")
+            generated_text = await self._generate(prompt)
+
+            if generated_text:
+                log.debug("✓ Generated %d characters", len(generated_text))
+                self._post_cache[key] = (time.monotonic() + POST_CACHE_TTL, generated_text)
+                self._post_cache.move_to_end(key)
+                if len(self._post_cache) > POST_CACHE_SIZE:
+                    self._post_cache.popitem(last=False)
                 return generated_text
             else:
-                print("✗ No text was generated")
+                log.warning("✗ No text was generated")
                 return None
 
         except Exception as e:
-            print(f"✗ Error generating text: {e}")
+            log.exception("✗ Error generating text: %s", e)
             return None
 
-    def generate_honey_info(self, honey_type: str) -> Optional[str]:
+    async def generate_honey_info(self, honey_type: str) -> Optional[str]:
         """
         Generate educational information about a specific type of honey in Georgian.
 
@@ -100,30 +239,15 @@ class TextGenerator:
             Educational text in Georgian
         """
         try:
-            prompt = f"""
-მომეცი მოკლე, ინფორმაციული აღწერა {honey_type}-ის შესახებ ქართულ ენაზე.
+            prompt = _HONEY_INFO_PROMPT_TEMPLATE.format_map({"honey_type": honey_type})
 
-მოიცავს:
-1. რა მცენარიდან მოდის ეს ძმარი
-2. მისი უნიკალური თვისებები
-3. რა სარგებელი მოაქვს ჯანმრთელობისთვის
-4. გემო და არომატი
-
-პასუხი უნდა იყოს 3-4 წინადადება, მარტივი და გასაგები ენით.
-"""
-
-            response = self.model.generate_content(prompt)
-
-            if response.text:
-                return response.text.strip()
-            else:
-                return None
+            return await self._generate(prompt)
 
         except Exception as e:
-            print(f"✗ Error generating honey info: {e}")
+            log.exception("✗ Error generating honey info: %s", e)
             return None
 
-    def improve_text(self, original_text: str, instruction: str) -> Optional[str]:
+    async def improve_text(self, original_text: str, instruction: str) -> Optional[str]:
         """
         Improve or modify existing text based on user instructions.
 
@@ -135,33 +259,22 @@ class TextGenerator:
             Improved text in Georgian
         """
         try:
-            prompt = f"""
-შეცვალე შემდეგი ტექსტი ამ ინსტრუქციის მიხედვით: "{instruction}"
+            prompt = _IMPROVE_PROMPT_TEMPLATE.format_map({
+                "instruction": instruction,
+                "original_text": original_text,
+            })
 
-ორიგინალი ტექსტი:
-{original_text}
-
-გაითვალისწინე:
-- შეინარჩუნე ქართული ენა
-- შეინარჩუნე ძირითადი მესიჯი
-- გააუმჯობესე მოთხოვნილი ასპექტი
-"""
-
-            response = self.model.generate_content(prompt)
-
-            if response.text:
-                return response.text.strip()
-            else:
-                return None
+            return await self._generate(prompt)
 
         except Exception as e:
-            print(f"✗ Error improving text: {e}")
+            log.exception("✗ Error improving text: %s", e)
             return None
 
 
 # Example usage and testing
 if __name__ == "__main__":
     # This is for testing only - normally called from main.py
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     # Get API key from environment
     api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
@@ -170,39 +283,45 @@ if __name__ == "__main__":
         print("⚠️  Please set GOOGLE_GEMINI_API_KEY environment variable")
         print("Example: export GOOGLE_GEMINI_API_KEY='your-api-key'")
     else:
-        # Initialize generator
-        generator = TextGenerator(api_key=api_key)
-
-        # Generate a test post
-        print("\n" + "=" * 50)
-        print("Testing Facebook Post Generation")
-        print("=" * 50 + "\n")
-
-        post = generator.generate_facebook_post(
-            honey_type="ბროწეულის ძმარი",
-            tone="friendly",
-            include_emoji=True
-        )
-
-        if post:
-            print("\n✓ Generated Post:\n")
-            print("-" * 50)
-            print(post)
-            print("-" * 50)
-        else:
-            print("\n✗ Failed to generate post")
-
-        # Test honey info generation
-        print("\n" + "=" * 50)
-        print("Testing Honey Info Generation")
-        print("=" * 50 + "\n")
-
-        info = generator.generate_honey_info("ბროწეულის ძმარი")
-
-        if info:
-            print("\n✓ Generated Info:\n")
-            print("-" * 50)
-            print(info)
-            print("-" * 50)
-        else:
-            print("\n✗ Failed to generate info")
+        async def demo():
+            # Initialize generator
+            generator = TextGenerator(api_key=api_key)
+
+            try:
+                # Generate a test post
+                print("\n" + "=" * 50)
+                print("Testing Facebook Post Generation")
+                print("=" * 50 + "\n")
+
+                post = await generator.generate_facebook_post(
+                    honey_type="ბროწეულის ძმარი",
+                    tone="friendly",
+                    include_emoji=True
+                )
+
+                if post:
+                    print("\n✓ Generated Post:\n")
+                    print("-" * 50)
+                    print(post)
+                    print("-" * 50)
+                else:
+                    print("\n✗ Failed to generate post")
+
+                # Test honey info generation
+                print("\n" + "=" * 50)
+                print("Testing Honey Info Generation")
+                print("=" * 50 + "\n")
+
+                info = await generator.generate_honey_info("ბროწეულის ძმარი")
+
+                if info:
+                    print("\n✓ Generated Info:\n")
+                    print("-" * 50)
+                    print(info)
+                    print("-" * 50)
+                else:
+                    print("\n✗ Failed to generate info")
+            finally:
+                await generator.close()
+
+        asyncio.run(demo())